@@ -12,22 +12,34 @@ reset_machine_manual.py - 机器ID重置工具
 """
 import os
 import sys
+import io
 import json
 import uuid
 import hashlib
-import shutil
 import sqlite3
 import platform
 import re
+import mmap
 import tempfile
-import glob
+import shutil
 from colorama import Fore, Style, init
 from typing import Tuple
 import configparser
 from new_signup import get_user_documents_path
-import traceback
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from config import get_config
 
+# Lazily imported by _import_winreg()
+_winreg = None
+
+# orjson is optional, the stdlib json module is used when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize colorama
 init()
 
@@ -42,6 +54,359 @@ EMOJI = {
     "WARNING": "⚠️",
 }
 
+# Status output of the resetter goes through one preconfigured handler,
+# messages already carry their color prefixes
+logger = logging.getLogger('cursor.reset')
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+# Log records of a worker thread are buffered here while _run_captured is active
+_captured = threading.local()
+
+class _CaptureFilter(logging.Filter):
+    """
+    暂存工作线程的日志记录
+    
+    当前线程正在_run_captured中运行时，记录被追加到该线程的缓冲列表，
+    不直接输出；其他线程的记录照常输出。
+    """
+    def filter(self, record):
+        records = getattr(_captured, "records", None)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
+logger.addFilter(_CaptureFilter())
+
+def _run_captured(func, *args):
+    """
+    运行func并收集它输出的日志记录
+    
+    用于线程池中的步骤，由调用方在合适的时机通过_replay_captured
+    按固定顺序输出，避免多个线程的输出互相穿插。
+    
+    参数:
+        func: 要运行的步骤函数
+        *args: 传给func的参数
+        
+    返回值:
+        tuple: (func的返回值, 日志记录列表)
+    """
+    _captured.records = records = []
+    try:
+        return func(*args), records
+    finally:
+        _captured.records = None
+
+def _replay_captured(future):
+    """
+    等待_run_captured任务完成，输出其日志记录并返回结果
+    
+    参数:
+        future: 提交了_run_captured的Future对象
+        
+    返回值:
+        func的返回值
+    """
+    result, records = future.result()
+    for record in records:
+        logger.handle(record)
+    return result
+
+# Prebuilt colored status prefixes
+_OK = f"{Fore.GREEN}{EMOJI['SUCCESS']} "
+_ERR = f"{Fore.RED}{EMOJI['ERROR']} "
+_WARN = f"{Fore.YELLOW}{EMOJI['WARNING']} "
+_INFO = f"{Fore.CYAN}{EMOJI['INFO']} "
+_RESET = Style.RESET_ALL
+
+# Process umask, read once at import so new files get the mode open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Markers left behind by modify_workbench_js / modify_main_js
+_WORKBENCH_SENTINEL = b'"f74c5e8a-0e20-4c1c-a48c-a5cbe71f4240"'
+_MAIN_SENTINEL = b't("true");return;'
+
+# Patterns are pure ASCII, so they are matched against the raw file bytes
+_WORKBENCH_PATTERN = re.compile(rb'(getUniqueIdentifier\(\)[^}]+return\s+)([^}]+)(;?\s*\})')
+_WORKBENCH_REPLACEMENT = rb'\1' + _WORKBENCH_SENTINEL + rb'\3'
+_MAIN_PATTERN = re.compile(rb'validateDeviceId\(\w+\)\{return new Promise\(\(\w+,\w+\)=>{')
+_MAIN_REPLACEMENT = rb'validateDeviceId(e){return new Promise((t,n)=>{' + _MAIN_SENTINEL
+_MAIN_PATCHED_PATTERN = re.compile(rb'new Promise\(\(\w+,\w+\)=>{(\w+)\("true"\)')
+
+def _print_debug_traceback():
+    """
+    打印当前异常的堆栈信息
+    
+    仅在设置了CURSOR_RESET_DEBUG环境变量时输出，正常使用时
+    只显示错误信息，避免traceback重新读取源码文件的开销。
+    """
+    if os.environ.get("CURSOR_RESET_DEBUG"):
+        import traceback
+        traceback.print_exc()
+
+def _import_winreg():
+    """
+    按需导入winreg模块
+    
+    winreg只在Windows上使用，首次调用时才导入并缓存到模块变量中，
+    避免在其他平台或不需要时承担导入开销。
+    
+    返回值:
+        module: winreg模块
+    """
+    global _winreg
+    if _winreg is None:
+        import winreg
+        _winreg = winreg
+    return _winreg
+
+def _existing(*paths):
+    """
+    筛选出实际存在的目录
+    
+    用于检查不含通配符的固定路径，直接使用os.path.isdir探测，
+    避免glob.glob的模式解析和目录遍历开销。
+    
+    参数:
+        *paths: 要检查的目录路径
+        
+    返回值:
+        generator: 依次产出存在的目录路径
+    """
+    return (path for path in paths if os.path.isdir(path))
+
+def _file_contains(file_path: str, marker: bytes) -> bool:
+    """
+    检查文件中是否包含指定的字节串
+    
+    通过mmap直接在原始字节上查找，不做UTF-8解码和正则匹配，
+    用于快速判断JS文件是否已经被修补过。
+    
+    参数:
+        file_path (str): 要检查的文件路径
+        marker (bytes): 要查找的字节串
+        
+    返回值:
+        bool: 找到返回True，找不到或文件无法读取返回False
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(marker) != -1
+    except (OSError, ValueError):
+        return False
+
+def _write_temp_file(file_path: str, data: bytes) -> str:
+    """
+    将内容写入目标文件旁边的临时文件
+    
+    通过tempfile.mkstemp在同目录下创建唯一命名的临时文件，避免与残留或
+    并发运行的临时文件冲突；数据通过一次os.write写入，并在关闭前fsync。
+    如果目标文件已存在，会把其原有的权限和所有者复制到临时文件上；
+    否则按umask设置权限，并沿用父目录的所有者（例如通过sudo运行时）。
+    写入失败时临时文件会被删除。
+    
+    参数:
+        file_path (str): 目标文件的完整路径
+        data (bytes): 要写入的完整内容
+        
+    返回值:
+        str: 临时文件路径
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        
+        # Keep the permissions of the file being replaced
+        try:
+            original_stat = os.stat(file_path)
+        except FileNotFoundError:
+            # New file: mkstemp creates it 0600, apply the usual umask-based mode instead
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+            if os.name != "nt":  # Not Windows
+                # Give it to the owner of the directory it is created in
+                parent_stat = os.stat(directory)
+                try:
+                    os.chown(tmp_path, parent_stat.st_uid, parent_stat.st_gid)
+                except PermissionError:
+                    pass
+        else:
+            os.chmod(tmp_path, original_stat.st_mode)
+            if os.name != "nt":  # Not Windows
+                try:
+                    os.chown(tmp_path, original_stat.st_uid, original_stat.st_gid)
+                except PermissionError:
+                    # Only root may give a file away; keep our own ownership like an in-place write would
+                    pass
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    
+    return tmp_path
+
+def _write_file_atomic(file_path: str, data: bytes):
+    """
+    原子地写入文件内容
+    
+    将数据写入同目录下的临时文件，同步到磁盘后通过os.replace
+    替换目标文件，避免写入中途崩溃导致文件损坏。
+    
+    参数:
+        file_path (str): 目标文件的完整路径
+        data (bytes): 要写入的完整内容
+    """
+    tmp_path = _write_temp_file(file_path, data)
+    try:
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def _commit_staged_files(pending):
+    """
+    批量提交暂存的临时文件
+    
+    临时文件在写入时已经fsync，这里依次用os.replace替换目标文件，
+    最后同步各父目录以持久化重命名操作。
+    
+    参数:
+        pending (list): (临时文件路径, 目标文件路径, 成功消息) 元组列表
+    """
+    if not pending:
+        return
+    
+    for tmp_path, file_path, _ in pending:
+        os.replace(tmp_path, file_path)
+    
+    # Directory fsync is only available on POSIX
+    if hasattr(os, "O_DIRECTORY"):
+        for directory in {os.path.dirname(file_path) for _, file_path, _ in pending}:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+def _discard_staged_files(pending):
+    """
+    丢弃暂存的临时文件
+    
+    重置流程失败时删除尚未提交的临时文件，保持目标文件不变。
+    
+    参数:
+        pending (list): (临时文件路径, 目标文件路径, 成功消息) 元组列表
+    """
+    for tmp_path, _, _ in pending or ():
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _backup_file(src: str, dst: str):
+    """
+    创建文件的独立备份副本
+    
+    始终复制数据而不是创建硬链接，因为Cursor会原地改写storage.json，
+    共享inode的备份会随之一起被修改。在Linux上优先使用
+    os.copy_file_range（支持reflink的文件系统上由内核完成复制），
+    否则退回到shutil.copyfile，最后复制权限和时间戳。
+    
+    参数:
+        src (str): 源文件路径
+        dst (str): 备份文件路径，已存在时会被覆盖
+    """
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    
+    copied_all = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            copied_all = remaining == 0
+        except OSError:
+            pass
+    
+    if not copied_all:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+def _load_json_file(file_path: str):
+    """
+    读取并解析JSON文件
+    
+    以二进制方式一次性读取整个文件后交给orjson（未安装时为json.loads）
+    解析，跳过文本模式下TextIOWrapper的逐块解码；在支持的平台上
+    提示内核按顺序预读。
+    
+    参数:
+        file_path (str): JSON文件路径
+        
+    返回值:
+        解析后的JSON数据
+    """
+    with open(file_path, 'rb') as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _dump_json_bytes(data) -> bytes:
+    """
+    将数据序列化为两空格缩进的UTF-8编码JSON
+    
+    安装了orjson时使用其原生实现，否则使用标准库json，两者输出格式一致，
+    与totally_reset_cursor.py写入的storage.json相同。
+    
+    参数:
+        data: 要序列化的数据
+        
+    返回值:
+        bytes: UTF-8编码的JSON内容
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _save_config(config, config_file):
+    """
+    原子地写入配置文件
+    
+    先将配置序列化到内存，再通过_write_file_atomic写入临时文件并替换原文件，
+    避免写入中途崩溃或并发调用导致配置文件被截断，同时保留原文件的权限和所有者。
+    
+    参数:
+        config: 要保存的ConfigParser对象
+        config_file (str): 配置文件的完整路径
+    """
+    buffer = io.StringIO()
+    config.write(buffer)
+    _write_file_atomic(config_file, buffer.getvalue().encode('utf-8'))
+
 def get_cursor_paths(translator=None) -> Tuple[str, str]:
     """
     获取Cursor应用程序的重要文件路径
@@ -61,7 +426,7 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
     system = platform.system()
     
     # Read config file
-    config = configparser.ConfigParser()
+    config = configparser.ConfigParser(interpolation=None, strict=False, empty_lines_in_values=False)
     config_dir = os.path.join(get_user_documents_path(), ".cursor-free-vip")
     config_file = os.path.join(config_dir, "config.ini")
     
@@ -77,22 +442,21 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
     }
     
     if system == "Linux":
-        # Look for extracted AppImage with correct usr structure
-        extracted_usr_paths = glob.glob(os.path.expanduser("~/squashfs-root/usr/share/cursor/resources/app"))
-        # Also check current directory for extraction without home path prefix
-        current_dir_paths = glob.glob("squashfs-root/usr/share/cursor/resources/app")
-        
-        # Add any found paths to the Linux paths list
-        default_paths["Linux"].extend(extracted_usr_paths)
-        default_paths["Linux"].extend(current_dir_paths)
+        # Look for extracted AppImage with correct usr structure,
+        # also check current directory for extraction without home path prefix
+        default_paths["Linux"].extend(_existing(
+            os.path.expanduser("~/squashfs-root/usr/share/cursor/resources/app"),
+            "squashfs-root/usr/share/cursor/resources/app"
+        ))
         
         # Print debug information
-        print(f"{Fore.CYAN}{EMOJI['INFO']} Available paths found:{Style.RESET_ALL}")
+        lines = [f"{_INFO}Available paths found:{_RESET}"]
         for path in default_paths["Linux"]:
             if os.path.exists(path):
-                print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {path} (exists){Style.RESET_ALL}")
+                lines.append(f"{_OK}{path} (exists){_RESET}")
             else:
-                print(f"{Fore.RED}{EMOJI['ERROR']} {path} (not found){Style.RESET_ALL}")
+                lines.append(f"{_ERR}{path} (not found){_RESET}")
+        print("\n".join(lines))
     
     
     # If config doesn't exist, create it with default paths
@@ -115,8 +479,7 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
                 # If no path exists, use the first one as default
                 config.set('LinuxPaths', 'cursor_path', default_paths["Linux"][0])
         
-        with open(config_file, 'w', encoding='utf-8') as f:
-            config.write(f)
+        _save_config(config, config_file)
     else:
         config.read(config_file, encoding='utf-8')
     
@@ -142,8 +505,7 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
                 base_path = path
                 # Update config with the found path
                 config.set(section, 'cursor_path', path)
-                with open(config_file, 'w', encoding='utf-8') as f:
-                    config.write(f)
+                _save_config(config, config_file)
                 break
     
     if not os.path.exists(base_path):
@@ -179,7 +541,7 @@ def get_cursor_machine_id_path(translator=None) -> str:
     # Read configuration
     config_dir = os.path.join(get_user_documents_path(), ".cursor-free-vip")
     config_file = os.path.join(config_dir, "config.ini")
-    config = configparser.ConfigParser()
+    config = configparser.ConfigParser(interpolation=None, strict=False, empty_lines_in_values=False)
     
     if os.path.exists(config_file):
         config.read(config_file)
@@ -208,10 +570,6 @@ def get_cursor_machine_id_path(translator=None) -> str:
     else:
         raise OSError(f"Unsupported operating system: {sys.platform}")
 
-    # Save any changes to config file
-    with open(config_file, 'w', encoding='utf-8') as f:
-        config.write(f)
-
 def get_workbench_cursor_path(translator=None) -> str:
     """
     获取Cursor工作台主JS文件路径
@@ -233,7 +591,7 @@ def get_workbench_cursor_path(translator=None) -> str:
     # Read configuration
     config_dir = os.path.join(get_user_documents_path(), ".cursor-free-vip")
     config_file = os.path.join(config_dir, "config.ini")
-    config = configparser.ConfigParser()
+    config = configparser.ConfigParser(interpolation=None, strict=False, empty_lines_in_values=False)
 
     if os.path.exists(config_file):
         config.read(config_file)
@@ -254,9 +612,9 @@ def get_workbench_cursor_path(translator=None) -> str:
     
     if system == "Linux":
         # Add extracted AppImage with correct usr structure
-        extracted_usr_paths = glob.glob(os.path.expanduser("~/squashfs-root/usr/share/cursor/resources/app"))
-            
-        paths_map["Linux"]["bases"].extend(extracted_usr_paths)
+        paths_map["Linux"]["bases"].extend(_existing(
+            os.path.expanduser("~/squashfs-root/usr/share/cursor/resources/app")
+        ))
 
     if system not in paths_map:
         raise OSError(translator.get('reset.unsupported_os', system=system) if translator else f"不支持的操作系统: {system}")
@@ -264,7 +622,7 @@ def get_workbench_cursor_path(translator=None) -> str:
     if system == "Linux":
         for base in paths_map["Linux"]["bases"]:
             main_path = os.path.join(base, paths_map["Linux"]["main"])
-            print(f"{Fore.CYAN}{EMOJI['INFO']} Checking path: {main_path}{Style.RESET_ALL}")
+            print(f"{_INFO}Checking path: {main_path}{_RESET}")
             if os.path.exists(main_path):
                 return main_path
 
@@ -299,7 +657,7 @@ def version_check(version: str, min_version: str = "", max_version: str = "", tr
     version_pattern = r"^\d+\.\d+\.\d+$"
     try:
         if not re.match(version_pattern, version):
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.invalid_version_format', version=version)}{Style.RESET_ALL}")
+            print(f"{_ERR}{translator.get('reset.invalid_version_format', version=version)}{_RESET}")
             return False
 
         def parse_version(ver: str) -> Tuple[int, ...]:
@@ -317,16 +675,16 @@ def version_check(version: str, min_version: str = "", max_version: str = "", tr
         current = parse_version(version)
 
         if min_version and current < parse_version(min_version):
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.version_too_low', version=version, min_version=min_version)}{Style.RESET_ALL}")
+            print(f"{_ERR}{translator.get('reset.version_too_low', version=version, min_version=min_version)}{_RESET}")
             return False
 
         if max_version and current > parse_version(max_version):
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.version_too_high', version=version, max_version=max_version)}{Style.RESET_ALL}")
+            print(f"{_ERR}{translator.get('reset.version_too_high', version=version, max_version=max_version)}{_RESET}")
             return False
 
         return True
     except Exception as e:
-        print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.version_check_error', error=str(e))}{Style.RESET_ALL}")
+        print(f"{_ERR}{translator.get('reset.version_check_error', error=str(e))}{_RESET}")
         return False
 
 def check_cursor_version(translator) -> bool:
@@ -353,7 +711,7 @@ def check_cursor_version(translator) -> bool:
         # Get Cursor paths
         pkg_path, _ = get_cursor_paths(translator)
         
-        print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.loading_package')}: {pkg_path}{Style.RESET_ALL}")
+        print(f"{_INFO}{translator.get('reset.loading_package')}: {pkg_path}{_RESET}")
         
         # Read package.json
         with open(pkg_path, 'r', encoding='utf-8') as f:
@@ -362,23 +720,23 @@ def check_cursor_version(translator) -> bool:
                 cursor_version = data.get('version', '')
                 
                 # Print current version
-                print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.cursor_version')}: {cursor_version}{Style.RESET_ALL}")
-                print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.supported_version')}: {min_version} - {max_version}{Style.RESET_ALL}")
+                print(f"{_INFO}{translator.get('reset.cursor_version')}: {cursor_version}{_RESET}")
+                print(f"{_INFO}{translator.get('reset.supported_version')}: {min_version} - {max_version}{_RESET}")
                 
                 # Check version compatibility
                 if version_check(cursor_version, min_version, max_version, translator):
-                    print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {translator.get('reset.version_supported')}{Style.RESET_ALL}")
+                    print(f"{_OK}{translator.get('reset.version_supported')}{_RESET}")
                     return True
                 else:
-                    print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.version_not_supported')}{Style.RESET_ALL}")
+                    print(f"{_ERR}{translator.get('reset.version_not_supported')}{_RESET}")
                     return False
                     
             except json.JSONDecodeError:
-                print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.invalid_json')}{Style.RESET_ALL}")
+                print(f"{_ERR}{translator.get('reset.invalid_json')}{_RESET}")
                 return False
                 
     except Exception as e:
-        print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.version_check_failed', error=str(e))}{Style.RESET_ALL}")
+        print(f"{_ERR}{translator.get('reset.version_check_failed', error=str(e))}{_RESET}")
         return False
 
 def modify_workbench_js(file_path: str, translator=None) -> bool:
@@ -395,52 +753,46 @@ def modify_workbench_js(file_path: str, translator=None) -> bool:
     返回值:
         bool: 修改成功返回True，否则返回False
     """
-    print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.modifying_workbench') if translator else '修改 workbench.js'}: {file_path}{Style.RESET_ALL}")
+    print(f"{_INFO}{translator.get('reset.modifying_workbench') if translator else '修改 workbench.js'}: {file_path}{_RESET}")
     
     # Create backup first
     backup_path = f"{file_path}.backup"
     if not os.path.exists(backup_path):
         try:
             shutil.copy2(file_path, backup_path)
-            print(f"{Fore.GREEN}{EMOJI['BACKUP']} {translator.get('reset.backup_created') if translator else '创建备份'}: {backup_path}{Style.RESET_ALL}")
+            print(f"{Fore.GREEN}{EMOJI['BACKUP']} {translator.get('reset.backup_created') if translator else '创建备份'}: {backup_path}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.backup_failed', error=str(e)) if translator else f'备份失败: {str(e)}'}{Style.RESET_ALL}")
+            print(f"{_ERR}{translator.get('reset.backup_failed', error=str(e)) if translator else f'备份失败: {str(e)}'}{_RESET}")
             return False
     
     try:
-        # Read file content
-        with open(file_path, 'r', encoding='utf-8') as f:
+        # Read raw file content, no decoding needed for ASCII patterns
+        with open(file_path, 'rb') as f:
             content = f.read()
         
-        # Define the code pattern to match
-        code_pattern = r'(getUniqueIdentifier\(\)[^}]+return\s+)([^}]+)(;?\s*\})'
-        
-        # Define the replacement code
-        replacement = r'\1"f74c5e8a-0e20-4c1c-a48c-a5cbe71f4240"\3'
-        
         # Check if pattern exists
-        if re.search(code_pattern, content):
+        if _WORKBENCH_PATTERN.search(content):
             # Already modified?
-            if '"f74c5e8a-0e20-4c1c-a48c-a5cbe71f4240"' in content:
-                print(f"{Fore.YELLOW}{EMOJI['WARNING']} {translator.get('reset.already_modified') if translator else '文件已被修改'}{Style.RESET_ALL}")
+            if _WORKBENCH_SENTINEL in content:
+                print(f"{_WARN}{translator.get('reset.already_modified') if translator else '文件已被修改'}{_RESET}")
                 return True
                 
             # Apply modification
-            modified_content = re.sub(code_pattern, replacement, content)
+            modified_content = _WORKBENCH_PATTERN.sub(_WORKBENCH_REPLACEMENT, content)
             
             # Write modified content back to file
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with open(file_path, 'wb') as f:
                 f.write(modified_content)
                 
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {translator.get('reset.modification_success') if translator else '修改成功'}{Style.RESET_ALL}")
+            print(f"{_OK}{translator.get('reset.modification_success') if translator else '修改成功'}{_RESET}")
             return True
         else:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.pattern_not_found') if translator else '未找到匹配模式'}{Style.RESET_ALL}")
+            print(f"{_ERR}{translator.get('reset.pattern_not_found') if translator else '未找到匹配模式'}{_RESET}")
             return False
             
     except Exception as e:
-        print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.modification_failed', error=str(e)) if translator else f'修改失败: {str(e)}'}{Style.RESET_ALL}")
-        traceback.print_exc()
+        print(f"{_ERR}{translator.get('reset.modification_failed', error=str(e)) if translator else f'修改失败: {str(e)}'}{_RESET}")
+        _print_debug_traceback()
         return False
 
 def modify_main_js(main_path: str, translator) -> bool:
@@ -457,44 +809,40 @@ def modify_main_js(main_path: str, translator) -> bool:
     返回值:
         bool: 修改成功返回True，否则返回False
     """
-    print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.modifying_main')}: {main_path}{Style.RESET_ALL}")
+    print(f"{_INFO}{translator.get('reset.modifying_main')}: {main_path}{_RESET}")
     
     # Create backup first
     backup_path = f"{main_path}.backup"
     if not os.path.exists(backup_path):
         try:
             shutil.copy2(main_path, backup_path)
-            print(f"{Fore.GREEN}{EMOJI['BACKUP']} {translator.get('reset.backup_created')}: {backup_path}{Style.RESET_ALL}")
+            print(f"{Fore.GREEN}{EMOJI['BACKUP']} {translator.get('reset.backup_created')}: {backup_path}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.backup_failed', error=str(e))}{Style.RESET_ALL}")
+            print(f"{_ERR}{translator.get('reset.backup_failed', error=str(e))}{_RESET}")
             return False
     
     try:
-        # Read file content
-        with open(main_path, 'r', encoding='utf-8') as f:
+        # Read raw file content, no decoding needed for ASCII patterns
+        with open(main_path, 'rb') as f:
             content = f.read()
         
         # Check if already modified
-        if "true" in content and re.search(r'new Promise\(\(\w+,\w+\)=>{(\w+)\("true"\)', content):
-            print(f"{Fore.YELLOW}{EMOJI['WARNING']} {translator.get('reset.already_modified')}{Style.RESET_ALL}")
+        if b"true" in content and _MAIN_PATCHED_PATTERN.search(content):
+            print(f"{_WARN}{translator.get('reset.already_modified')}{_RESET}")
             return True
             
         # Apply modification
-        modified_content = re.sub(
-            r'validateDeviceId\(\w+\)\{return new Promise\(\(\w+,\w+\)=>{',
-            r'validateDeviceId(e){return new Promise((t,n)=>{t("true");return;',
-            content
-        )
+        modified_content = _MAIN_PATTERN.sub(_MAIN_REPLACEMENT, content)
         
         # Write modified content back to file
-        with open(main_path, 'w', encoding='utf-8') as f:
+        with open(main_path, 'wb') as f:
             f.write(modified_content)
             
-        print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {translator.get('reset.modification_success')}{Style.RESET_ALL}")
+        print(f"{_OK}{translator.get('reset.modification_success')}{_RESET}")
         return True
             
     except Exception as e:
-        print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.modification_failed', error=str(e))}{Style.RESET_ALL}")
+        print(f"{_ERR}{translator.get('reset.modification_failed', error=str(e))}{_RESET}")
         return False
 
 def patch_cursor_get_machine_id(translator) -> bool:
@@ -513,29 +861,33 @@ def patch_cursor_get_machine_id(translator) -> bool:
     try:
         # Get paths
         pkg_path, main_path = get_cursor_paths(translator)
-        print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.cursor_paths_found')}{Style.RESET_ALL}")
+        print(f"{_INFO}{translator.get('reset.cursor_paths_found')}{_RESET}")
         
         # Print paths
-        print(f"{Fore.CYAN}{EMOJI['INFO']} package.json: {pkg_path}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{EMOJI['INFO']} main.js: {main_path}{Style.RESET_ALL}")
+        print(f"{_INFO}package.json: {pkg_path}{_RESET}")
+        print(f"{_INFO}main.js: {main_path}{_RESET}")
         
-        # Check if files exist and are readable
-        if not os.path.exists(pkg_path) or not os.access(pkg_path, os.R_OK):
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.file_not_readable', path=pkg_path)}{Style.RESET_ALL}")
-            return False
-            
-        if not os.path.exists(main_path) or not os.access(main_path, os.R_OK):
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.file_not_readable', path=main_path)}{Style.RESET_ALL}")
-            return False
+        # Check if files exist, read permission problems surface at open() time
+        for file_path in (pkg_path, main_path):
+            try:
+                os.stat(file_path)
+            except FileNotFoundError:
+                print(f"{_ERR}{translator.get('reset.file_not_readable', path=file_path)}{_RESET}")
+                return False
             
         # Check if we have write permissions
         if not os.access(os.path.dirname(main_path), os.W_OK):
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.no_write_permission', path=main_path)}{Style.RESET_ALL}")
+            print(f"{_ERR}{translator.get('reset.no_write_permission', path=main_path)}{_RESET}")
             return False
             
-        # Get workbench.js path
+        # Get workbench.js path only once the cheap checks have passed
         workbench_path = get_workbench_cursor_path(translator)
-        print(f"{Fore.CYAN}{EMOJI['INFO']} workbench.js: {workbench_path}{Style.RESET_ALL}")
+        print(f"{_INFO}workbench.js: {workbench_path}{_RESET}")
+        
+        # Skip all regex work if both files were patched by a previous run
+        if _file_contains(main_path, _MAIN_SENTINEL) and _file_contains(workbench_path, _WORKBENCH_SENTINEL):
+            print(f"{_WARN}{translator.get('reset.already_modified')}{_RESET}")
+            return True
         
         # Modify main.js
         if not modify_main_js(main_path, translator):
@@ -545,12 +897,12 @@ def patch_cursor_get_machine_id(translator) -> bool:
         if not modify_workbench_js(workbench_path, translator):
             return False
             
-        print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {translator.get('reset.patch_success')}{Style.RESET_ALL}")
+        print(f"{_OK}{translator.get('reset.patch_success')}{_RESET}")
         return True
         
     except Exception as e:
-        print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.patch_failed', error=str(e))}{Style.RESET_ALL}")
-        traceback.print_exc()
+        print(f"{_ERR}{translator.get('reset.patch_failed', error=str(e))}{_RESET}")
+        _print_debug_traceback()
         return False
 
 class MachineIDResetter:
@@ -561,6 +913,29 @@ class MachineIDResetter:
     包括本地存储的ID、SQLite数据库中的ID和系统级的ID。
     支持Windows、macOS和Linux系统，并自动处理不同平台的路径差异。
     """
+    # Keys copied from the generated IDs into storage.json and state.vscdb
+    TELEMETRY_PREFIX = "telemetry."
+    EXTRA_KEYS = frozenset({"storage.serviceMachineId"})
+    # Set once the macOS platform UUID warning has been shown
+    _warned_macos_uuid = False
+    # Fixed messages printed on the reset path, resolved once per resetter
+    MESSAGE_KEYS = (
+        'reset.starting_reset',
+        'reset.ids_generated',
+        'reset.machine_id_updated',
+        'reset.updating_storage',
+        'reset.updating_pair',
+        'reset.storage_unchanged',
+        'reset.storage_backup_created',
+        'reset.storage_updated',
+        'reset.storage_update_warning',
+        'reset.sqlite_update_warning',
+        'reset.sqlite_not_found',
+        'reset.system_ids_update_warning',
+        'reset.patch_warning',
+        'reset.reset_complete',
+    )
+
     def __init__(self, translator=None):
         """
         初始化机器ID重置器
@@ -577,16 +952,28 @@ class MachineIDResetter:
             NotImplementedError: 当不支持当前操作系统时抛出
         """
         self.translator = translator
+        self._msgs = {
+            name: translator.get(name) if translator else name
+            for name in self.MESSAGE_KEYS
+        }
+        self._dirs_ensured = set()
+        self._pending_renames = None
+        self._sqm_key = None
+        # Whether generate_new_ids managed to write (or stage) the machineId file
+        self._machine_id_ok = False
+        # storage.json values written by the last update_storage_json call
+        self._storage_written = None
 
         # Read configuration
         config_dir = os.path.join(get_user_documents_path(), ".cursor-free-vip")
         config_file = os.path.join(config_dir, "config.ini")
-        config = configparser.ConfigParser()
+        config = configparser.ConfigParser(interpolation=None, strict=False, empty_lines_in_values=False)
         
         if not os.path.exists(config_file):
             raise FileNotFoundError(f"Config file not found: {config_file}")
         
         config.read(config_file, encoding='utf-8')
+        dirty = False
 
         # Check operating system
         if sys.platform == "win32":  # Windows
@@ -596,6 +983,7 @@ class MachineIDResetter:
             
             if not config.has_section('WindowsPaths'):
                 config.add_section('WindowsPaths')
+                dirty = True
                 config.set('WindowsPaths', 'storage_path', os.path.join(
                     appdata, "Cursor", "User", "globalStorage", "storage.json"
                 ))
@@ -609,6 +997,7 @@ class MachineIDResetter:
         elif sys.platform == "darwin":  # macOS
             if not config.has_section('MacPaths'):
                 config.add_section('MacPaths')
+                dirty = True
                 config.set('MacPaths', 'storage_path', os.path.abspath(os.path.expanduser(
                     "~/Library/Application Support/Cursor/User/globalStorage/storage.json"
                 )))
@@ -622,6 +1011,7 @@ class MachineIDResetter:
         elif sys.platform == "linux":  # Linux
             if not config.has_section('LinuxPaths'):
                 config.add_section('LinuxPaths')
+                dirty = True
                 # Get actual user's home directory
                 sudo_user = os.environ.get('SUDO_USER')
                 actual_home = f"/home/{sudo_user}" if sudo_user else os.path.expanduser("~")
@@ -641,9 +1031,9 @@ class MachineIDResetter:
         else:
             raise NotImplementedError(f"Not Supported OS: {sys.platform}")
 
-        # Save any changes to config file
-        with open(config_file, 'w', encoding='utf-8') as f:
-            config.write(f)
+        # Save config file only if default paths were added
+        if dirty:
+            _save_config(config, config_file)
 
     def generate_new_ids(self):
         """
@@ -655,19 +1045,22 @@ class MachineIDResetter:
         返回值:
             dict: 包含各种新生成ID的字典，键为ID名称，值为ID值
         """
-        # Generate new UUID
-        dev_device_id = str(uuid.uuid4())
+        # Fetch all the entropy needed below with a single urandom call
+        raw = os.urandom(16 + 16 + 32 + 64)
+
+        # Generate new UUID (version 4, variant bits are set by uuid.UUID)
+        dev_device_id = str(uuid.UUID(bytes=raw[0:16], version=4))
 
         # Generate new machineId (64 characters of hexadecimal)
-        machine_id = hashlib.sha256(os.urandom(32)).hexdigest()
+        machine_id = hashlib.sha256(raw[32:64]).hexdigest()
 
         # Generate new macMachineId (128 characters of hexadecimal)
-        mac_machine_id = hashlib.sha512(os.urandom(64)).hexdigest()
+        mac_machine_id = hashlib.sha512(raw[64:128]).hexdigest()
 
         # Generate new sqmId
-        sqm_id = "{" + str(uuid.uuid4()).upper() + "}"
+        sqm_id = "{" + str(uuid.UUID(bytes=raw[16:32], version=4)).upper() + "}"
 
-        self.update_machine_id_file(dev_device_id)
+        self._machine_id_ok = self.update_machine_id_file(dev_device_id)
 
         return {
             "telemetry.devDeviceId": dev_device_id,
@@ -691,36 +1084,44 @@ class MachineIDResetter:
             bool: 更新成功返回True，失败返回False
         """
         try:
-            print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.updating_sqlite')}...{Style.RESET_ALL}")
+            logger.info(f"{_INFO}{self.translator.get('reset.updating_sqlite')}...{_RESET}")
             
-            conn = sqlite3.connect(self.sqlite_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ItemTable (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
-                )
-            """)
-
-            updates = [
-                (key, value) for key, value in new_ids.items()
-            ]
-
-            for key, value in updates:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO ItemTable (key, value) 
-                    VALUES (?, ?)
-                """, (key, value))
-                print(f"{EMOJI['INFO']} {Fore.CYAN} {self.translator.get('reset.updating_pair')}: {key}{Style.RESET_ALL}")
-
-            conn.commit()
-            conn.close()
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.sqlite_success')}{Style.RESET_ALL}")
+            # Manage the transaction explicitly so all rows share one commit
+            conn = sqlite3.connect(self.sqlite_path, isolation_level=None)
+            try:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS ItemTable (
+                            key TEXT PRIMARY KEY,
+                            value TEXT
+                        )
+                    """)
+
+                    updates = [
+                        (key, value) for key, value in new_ids.items()
+                        if key.startswith(self.TELEMETRY_PREFIX) or key in self.EXTRA_KEYS
+                    ]
+
+                    cursor.executemany("""
+                        INSERT OR REPLACE INTO ItemTable (key, value) 
+                        VALUES (?, ?)
+                    """, updates)
+
+                    cursor.execute("COMMIT")
+                except Exception:
+                    cursor.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+            logger.info(f"{_INFO}{self._msgs['reset.updating_pair']}: {', '.join(key for key, _ in updates)}{_RESET}")
+            logger.info(f"{_OK}{self.translator.get('reset.sqlite_success')}{_RESET}")
             return True
 
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.sqlite_error', error=str(e))}{Style.RESET_ALL}")
+            logger.error(f"{_ERR}{self.translator.get('reset.sqlite_error', error=str(e))}{_RESET}")
             return False
 
     def update_system_ids(self, new_ids):
@@ -737,7 +1138,7 @@ class MachineIDResetter:
             bool: 更新成功返回True，失败返回False
         """
         try:
-            print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.updating_system_ids')}...{Style.RESET_ALL}")
+            logger.info(f"{_INFO}{self.translator.get('reset.updating_system_ids')}...{_RESET}")
             
             if sys.platform.startswith("win"):
                 self._update_windows_machine_guid()
@@ -745,10 +1146,10 @@ class MachineIDResetter:
             elif sys.platform == "darwin":
                 self._update_macos_platform_uuid(new_ids)
                 
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.system_ids_updated')}{Style.RESET_ALL}")
+            logger.info(f"{_OK}{self.translator.get('reset.system_ids_updated')}{_RESET}")
             return True
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.system_ids_update_failed', error=str(e))}{Style.RESET_ALL}")
+            logger.error(f"{_ERR}{self.translator.get('reset.system_ids_update_failed', error=str(e))}{_RESET}")
             return False
 
     def _update_windows_machine_guid(self):
@@ -763,7 +1164,7 @@ class MachineIDResetter:
             Exception: 更新失败时抛出
         """
         try:
-            import winreg
+            winreg = _import_winreg()
             key = winreg.OpenKey(
                 winreg.HKEY_LOCAL_MACHINE,
                 "SOFTWARE\\Microsoft\\Cryptography",
@@ -773,12 +1174,12 @@ class MachineIDResetter:
             new_guid = str(uuid.uuid4())
             winreg.SetValueEx(key, "MachineGuid", 0, winreg.REG_SZ, new_guid)
             winreg.CloseKey(key)
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.windows_machine_guid_updated')}{Style.RESET_ALL}")
+            logger.info(f"{_OK}{self.translator.get('reset.windows_machine_guid_updated')}{_RESET}")
         except PermissionError:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.permission_denied')}{Style.RESET_ALL}")
+            logger.error(f"{_ERR}{self.translator.get('reset.permission_denied')}{_RESET}")
             raise
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.update_windows_machine_guid_failed', error=str(e))}{Style.RESET_ALL}")
+            logger.error(f"{_ERR}{self.translator.get('reset.update_windows_machine_guid_failed', error=str(e))}{_RESET}")
             raise
     
     def _update_windows_machine_id(self):
@@ -792,42 +1193,57 @@ class MachineIDResetter:
             bool: 更新成功返回True，失败返回False
         """
         try:
-            import winreg
+            winreg = _import_winreg()
             # 1. Generate new GUID
             new_guid = "{" + str(uuid.uuid4()).upper() + "}"
-            print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.new_machine_id')}: {new_guid}{Style.RESET_ALL}")
+            logger.info(f"{_INFO}{self.translator.get('reset.new_machine_id')}: {new_guid}{_RESET}")
             
-            # 2. Open the registry key
-            try:
-                key = winreg.OpenKey(
-                    winreg.HKEY_LOCAL_MACHINE,
-                    r"SOFTWARE\Microsoft\SQMClient",
-                    0,
-                    winreg.KEY_WRITE | winreg.KEY_WOW64_64KEY
-                )
-            except FileNotFoundError:
-                # If the key does not exist, create it
-                key = winreg.CreateKey(
-                    winreg.HKEY_LOCAL_MACHINE,
-                    r"SOFTWARE\Microsoft\SQMClient"
-                )
+            # 2. Open (or create) the registry key, reused across calls
+            key = self._get_sqm_key()
             
             # 3. Set MachineId value
             winreg.SetValueEx(key, "MachineId", 0, winreg.REG_SZ, new_guid)
-            winreg.CloseKey(key)
             
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.windows_machine_id_updated')}{Style.RESET_ALL}")
+            logger.info(f"{_OK}{self.translator.get('reset.windows_machine_id_updated')}{_RESET}")
             return True
             
         except PermissionError:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.permission_denied')}{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}{EMOJI['WARNING']} {self.translator.get('reset.run_as_admin')}{Style.RESET_ALL}")
+            logger.error(f"{_ERR}{self.translator.get('reset.permission_denied')}{_RESET}")
+            logger.warning(f"{_WARN}{self.translator.get('reset.run_as_admin')}{_RESET}")
             return False
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.update_windows_machine_id_failed', error=str(e))}{Style.RESET_ALL}")
+            logger.error(f"{_ERR}{self.translator.get('reset.update_windows_machine_id_failed', error=str(e))}{_RESET}")
             return False
                     
 
+    def _get_sqm_key(self):
+        """
+        获取SQMClient注册表项的句柄
+        
+        首次调用时通过CreateKeyEx一次性打开或创建注册表项，
+        之后的调用直接复用缓存的句柄，句柄在对象销毁时关闭。
+        
+        返回值:
+            winreg.HKEYType: SOFTWARE\\Microsoft\\SQMClient的注册表句柄
+        """
+        if self._sqm_key is None:
+            winreg = _import_winreg()
+            self._sqm_key = winreg.CreateKeyEx(
+                winreg.HKEY_LOCAL_MACHINE,
+                r"SOFTWARE\Microsoft\SQMClient",
+                0,
+                winreg.KEY_READ | winreg.KEY_WRITE | winreg.KEY_WOW64_64KEY
+            )
+        return self._sqm_key
+
+    def __del__(self):
+        """
+        释放缓存的注册表句柄
+        """
+        key = getattr(self, "_sqm_key", None)
+        if key is not None:
+            key.Close()
+
     def _update_macos_platform_uuid(self, new_ids):
         """
         更新macOS平台UUID
@@ -838,14 +1254,58 @@ class MachineIDResetter:
         参数:
             new_ids (dict): 包含新ID的字典，键为ID名称，值为ID值
             
+        返回值:
+            bool: 始终返回True
+            
         注意:
             此方法在macOS系统上通常是无操作的，因为修改系统级UUID需要root权限
-            并可能导致系统不稳定。
+            并可能导致系统不稳定。提示信息每个进程只显示一次。
         """
         # This is a no-op for normal users as changing the platform UUID
         # requires root permissions and can destabilize macOS
-        print(f"{Fore.YELLOW}{EMOJI['WARNING']} {self.translator.get('reset.macos_uuid_warning')}{Style.RESET_ALL}")
-        pass
+        if sys.platform != "darwin":
+            return True
+        
+        # Only warn once per process
+        if not MachineIDResetter._warned_macos_uuid:
+            MachineIDResetter._warned_macos_uuid = True
+            logger.warning(f"{_WARN}{self.translator.get('reset.macos_uuid_warning')}{_RESET}")
+        return True
+
+    def _write_file(self, file_path, data, done_message):
+        """
+        写入文件内容
+        
+        在reset()执行期间只写入临时文件并登记，由reset()在所有步骤成功后
+        统一重命名，并在重命名之后输出成功消息；单独调用时直接原子写入。
+        
+        参数:
+            file_path (str): 目标文件路径
+            data (bytes): 要写入的完整内容
+            done_message (str): 文件替换完成后输出的消息
+            
+        返回值:
+            str: 已直接写入时返回done_message，暂存时返回None
+        """
+        if self._pending_renames is None:
+            _write_file_atomic(file_path, data)
+            return done_message
+        self._pending_renames.append((_write_temp_file(file_path, data), file_path, done_message))
+        return None
+
+    def _ensure_dir(self, directory):
+        """
+        确保目录存在
+        
+        每个目录只在第一次调用时执行os.makedirs，之后直接跳过，
+        避免重复对各级父目录进行stat检查。
+        
+        参数:
+            directory (str): 需要存在的目录路径
+        """
+        if directory not in self._dirs_ensured:
+            os.makedirs(directory, exist_ok=True)
+            self._dirs_ensured.add(directory)
 
     def update_machine_id_file(self, new_id):
         """
@@ -865,17 +1325,19 @@ class MachineIDResetter:
             machine_id_path = get_cursor_machine_id_path(self.translator)
             
             # Ensure directory exists
-            os.makedirs(os.path.dirname(machine_id_path), exist_ok=True)
+            self._ensure_dir(os.path.dirname(machine_id_path))
             
-            # Write new ID to file
-            with open(machine_id_path, 'w', encoding='utf-8') as f:
-                f.write(new_id)
-                
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.machine_id_updated')}: {machine_id_path}{Style.RESET_ALL}")
+            # Write new ID to file, reporting success once it is in place
+            done = self._write_file(
+                machine_id_path, new_id.encode('utf-8'),
+                f"{_OK}{self._msgs['reset.machine_id_updated']}: {machine_id_path}{_RESET}",
+            )
+            if done:
+                logger.info(done)
             return True
             
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.update_machine_id_failed', error=str(e))}{Style.RESET_ALL}")
+            logger.error(f"{_ERR}{self.translator.get('reset.update_machine_id_failed', error=str(e))}{_RESET}")
             return False
             
     def update_storage_json(self, new_ids):
@@ -891,45 +1353,54 @@ class MachineIDResetter:
         返回值:
             bool: 更新成功返回True，失败返回False
         """
+        # Collect status lines and log them as one record
+        lines = [f"{_INFO}{self._msgs['reset.updating_storage']}...{_RESET}"]
         try:
-            print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.updating_storage')}...{Style.RESET_ALL}")
-            
-            # Create storage.json backup
-            if os.path.exists(self.db_path):
-                backup_path = f"{self.db_path}.bak"
-                shutil.copy2(self.db_path, backup_path)
-                print(f"{Fore.GREEN}{EMOJI['BACKUP']} {self.translator.get('reset.storage_backup_created')}: {backup_path}{Style.RESET_ALL}")
-                
+            storage_exists = os.path.exists(self.db_path)
+            if storage_exists:
                 # Load existing JSON data
-                with open(self.db_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_json_file(self.db_path)
             else:
                 # Create new storage.json if it doesn't exist
-                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                self._ensure_dir(os.path.dirname(self.db_path))
                 data = {}
                 
-            # Update telemetry IDs
-            for key, value in new_ids.items():
-                if key.startswith("telemetry."):
-                    data[key] = value
-                    print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.updating_pair')}: {key}{Style.RESET_ALL}")
+            # Update telemetry IDs and storage.serviceMachineId in one go
+            updates = {
+                key: value for key, value in new_ids.items()
+                if key.startswith(self.TELEMETRY_PREFIX) or key in self.EXTRA_KEYS
+            }
+            lines.append(f"{_INFO}{self._msgs['reset.updating_pair']}: {', '.join(updates)}{_RESET}")
             
-            # Special handling for storage.serviceMachineId
-            service_machine_id_key = "storage.serviceMachineId"
-            if service_machine_id_key in new_ids:
-                data[service_machine_id_key] = new_ids[service_machine_id_key]
-                print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.updating_pair')}: {service_machine_id_key}{Style.RESET_ALL}")
+            # Fresh IDs never match the file, so only a repeated call with the
+            # IDs written last time can find every value already in place
+            if (storage_exists and updates == self._storage_written
+                    and all(data.get(key) == value for key, value in updates.items())):
+                lines.append(f"{_OK}{self._msgs['reset.storage_unchanged']}{_RESET}")
+                return True
+            data.update(updates)
             
-            # Write updated data back to file
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-                
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.storage_updated')}{Style.RESET_ALL}")
+            # Create storage.json backup
+            if storage_exists:
+                backup_path = f"{self.db_path}.bak"
+                _backup_file(self.db_path, backup_path)
+                lines.append(f"{Fore.GREEN}{EMOJI['BACKUP']} {self._msgs['reset.storage_backup_created']}: {backup_path}{_RESET}")
+            
+            # Serialize once and atomically replace the file
+            done = self._write_file(
+                self.db_path, _dump_json_bytes(data),
+                f"{_OK}{self._msgs['reset.storage_updated']}{_RESET}",
+            )
+            if done:
+                lines.append(done)
+            self._storage_written = updates
             return True
             
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.storage_update_failed', error=str(e))}{Style.RESET_ALL}")
+            lines.append(f"{_ERR}{self.translator.get('reset.storage_update_failed', error=str(e))}{_RESET}")
             return False
+        finally:
+            logger.info("\n".join(lines))
             
     def reset(self):
         """
@@ -944,40 +1415,80 @@ class MachineIDResetter:
         6. 修补Cursor代码
         
         返回值:
-            bool: 重置流程完全成功返回True，任何步骤失败返回False
+            bool: 重置流程完全成功返回True，任何步骤失败返回False；
+                machineId或storage.json写入失败时两者都不会被替换
         """
         try:
-            print(f"{Fore.CYAN}{EMOJI['RESET']} {self.translator.get('reset.starting_reset')}{Style.RESET_ALL}")
+            logger.info(f"{Fore.CYAN}{EMOJI['RESET']} {self._msgs['reset.starting_reset']}{_RESET}")
             
-            # Generate new IDs
-            new_ids = self.generate_new_ids()
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.ids_generated')}{Style.RESET_ALL}")
-            
-            # Update storage.json
-            if not self.update_storage_json(new_ids):
-                print(f"{Fore.YELLOW}{EMOJI['WARNING']} {self.translator.get('reset.storage_update_warning')}{Style.RESET_ALL}")
-            
-            # Update SQLite database if it exists
-            if os.path.exists(self.sqlite_path):
-                if not self.update_sqlite_db(new_ids):
-                    print(f"{Fore.YELLOW}{EMOJI['WARNING']} {self.translator.get('reset.sqlite_update_warning')}{Style.RESET_ALL}")
-            else:
-                print(f"{Fore.YELLOW}{EMOJI['WARNING']} {self.translator.get('reset.sqlite_not_found')}: {self.sqlite_path}{Style.RESET_ALL}")
+            # Stage storage.json and machineId writes, then rename them together
+            self._pending_renames = []
+            committed = False
+            try:
+                # Generate new IDs
+                new_ids = self.generate_new_ids()
+                logger.info(f"{_OK}{self._msgs['reset.ids_generated']}{_RESET}")
                 
-            # Update system-level IDs
-            if not self.update_system_ids(new_ids):
-                print(f"{Fore.YELLOW}{EMOJI['WARNING']} {self.translator.get('reset.system_ids_update_warning')}{Style.RESET_ALL}")
+                # machineId and storage.json are replaced together, so both must be staged
+                files_ok = self._machine_id_ok
                 
-            # Patch Cursor code
-            if not patch_cursor_get_machine_id(self.translator):
-                print(f"{Fore.YELLOW}{EMOJI['WARNING']} {self.translator.get('reset.patch_warning')}{Style.RESET_ALL}")
+                # SQLite and the system IDs share no files with storage.json or each other,
+                # so they run in worker threads while storage.json is written. Their log
+                # output is buffered and replayed after each join to keep a fixed order.
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    sqlite_future = None
+                    if os.path.exists(self.sqlite_path):
+                        sqlite_future = executor.submit(_run_captured, self.update_sqlite_db, new_ids)
+                    system_future = executor.submit(_run_captured, self.update_system_ids, new_ids)
+                    
+                    # Update storage.json
+                    if not self.update_storage_json(new_ids):
+                        logger.warning(f"{_WARN}{self._msgs['reset.storage_update_warning']}{_RESET}")
+                        files_ok = False
+                    success = files_ok
+                    
+                    # Update SQLite database if it exists
+                    if sqlite_future is not None:
+                        if not _replay_captured(sqlite_future):
+                            logger.warning(f"{_WARN}{self._msgs['reset.sqlite_update_warning']}{_RESET}")
+                            success = False
+                    else:
+                        logger.warning(f"{_WARN}{self._msgs['reset.sqlite_not_found']}: {self.sqlite_path}{_RESET}")
+                    
+                    # Update system-level IDs
+                    if not _replay_captured(system_future):
+                        logger.warning(f"{_WARN}{self._msgs['reset.system_ids_update_warning']}{_RESET}")
+                        success = False
                 
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.reset_complete')}{Style.RESET_ALL}")
-            return True
+                # Patch Cursor code; it prints directly, so it runs after the pool has joined
+                if not patch_cursor_get_machine_id(self.translator):
+                    logger.warning(f"{_WARN}{self._msgs['reset.patch_warning']}{_RESET}")
+                    success = False
+            
+                # Replace the staged files only when neither of them failed, never a partial set
+                if files_ok:
+                    _commit_staged_files(self._pending_renames)
+                    committed = True
+            finally:
+                pending, self._pending_renames = self._pending_renames, None
+                if not committed:
+                    _discard_staged_files(pending)
+            
+            if not committed:
+                logger.error(f"{_ERR}{self.translator.get('reset.reset_failed', error='machineId/storage.json not updated')}{_RESET}")
+                return False
+            
+            # Report the staged files now that they are in place
+            lines = [message for _, _, message in pending]
+            if success:
+                lines.append(f"{_OK}{self._msgs['reset.reset_complete']}{_RESET}")
+            if lines:
+                logger.info("\n".join(lines))
+            return success
             
         except Exception as e:
-            print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.reset_failed', error=str(e))}{Style.RESET_ALL}")
-            traceback.print_exc()
+            logger.error(f"{_ERR}{self.translator.get('reset.reset_failed', error=str(e))}{_RESET}")
+            _print_debug_traceback()
             return False
 
 def run(translator=None):
@@ -996,14 +1507,14 @@ def run(translator=None):
     config = get_config(translator)
     if not config:
         return False
-    print(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}{EMOJI['RESET']} {translator.get('reset.title')}{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
+    print(f"\n{Fore.CYAN}{'='*50}{_RESET}")
+    print(f"{Fore.CYAN}{EMOJI['RESET']} {translator.get('reset.title')}{_RESET}")
+    print(f"{Fore.CYAN}{'='*50}{_RESET}")
 
     resetter = MachineIDResetter(translator)  # Correctly pass translator
     resetter.reset()
 
-    print(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
+    print(f"\n{Fore.CYAN}{'='*50}{_RESET}")
     input(f"{EMOJI['INFO']} {translator.get('reset.press_enter')}...")
 
 def main():
@@ -1024,10 +1535,10 @@ def main():
         
         run(translator)
     except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}操作已被用户中断{Style.RESET_ALL}")
+        print(f"\n{Fore.YELLOW}操作已被用户中断{_RESET}")
     except Exception as e:
-        print(f"\n{Fore.RED}发生错误: {str(e)}{Style.RESET_ALL}")
-        traceback.print_exc()
+        print(f"\n{Fore.RED}发生错误: {type(e).__name__}: {str(e)}{_RESET}")
+        _print_debug_traceback()
         
 if __name__ == "__main__":
     main()
@@ -15,19 +15,25 @@ import os
 import sys
 import json
 import uuid
-import hashlib
 import shutil
 import sqlite3
 import platform
+import subprocess
 import re
 import tempfile
 from colorama import Fore, Style, init
 from typing import Tuple
+from functools import lru_cache
 import configparser
 from new_signup import get_user_documents_path
 import traceback
 from config import get_config
-import glob
+
+# orjson is optional, the stdlib json module is used when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize colorama
 init()
@@ -43,6 +49,257 @@ EMOJI = {
     "WARNING": "⚠️",
 }
 
+# Parsed config.ini shared by the path helpers, reused until the file's mtime changes
+_CONFIG_CACHE = {"path": None, "mtime": None, "config": None}
+
+def _config_mtime(config_file: str):
+    """
+    获取配置文件的mtime，文件不存在时返回None
+    
+    参数:
+        config_file (str): 配置文件路径
+        
+    返回值:
+        int | None: 文件的st_mtime_ns
+    """
+    try:
+        return os.stat(config_file).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _load_config(config_file: str):
+    """
+    读取配置文件（带缓存）
+    
+    以文件的st_mtime_ns作为缓存标记，文件未变化时直接返回已解析的
+    ConfigParser对象，避免重复解析同一个config.ini。
+    
+    参数:
+        config_file (str): 配置文件路径
+        
+    返回值:
+        tuple: (ConfigParser对象, 文件mtime)，文件不存在时mtime为None
+    """
+    mtime = _config_mtime(config_file)
+    if mtime is None:
+        return configparser.ConfigParser(), None
+    
+    if _CONFIG_CACHE["path"] == config_file and _CONFIG_CACHE["mtime"] == mtime:
+        return _CONFIG_CACHE["config"], mtime
+    
+    config = configparser.ConfigParser()
+    config.read(config_file, encoding='utf-8')
+    _CONFIG_CACHE.update(path=config_file, mtime=mtime, config=config)
+    return config, mtime
+
+@lru_cache(maxsize=1)
+def _docs_path() -> str:
+    """
+    获取用户文档目录（进程内只查询一次）
+    
+    返回值:
+        str: get_user_documents_path()的结果
+    """
+    return get_user_documents_path()
+
+def _config_path() -> str:
+    """
+    获取config.ini的路径
+    
+    返回值:
+        str: 文档目录下.cursor-free-vip/config.ini的完整路径
+    """
+    return os.path.join(_docs_path(), ".cursor-free-vip", "config.ini")
+
+def _get_config():
+    """
+    获取共享的配置解析器
+    
+    所有路径辅助函数共用同一个ConfigParser对象，文件mtime变化时才重新解析。
+    
+    返回值:
+        tuple: (ConfigParser对象, 配置文件路径, 文件mtime)，文件不存在时mtime为None
+    """
+    config_file = _config_path()
+    config, mtime = _load_config(config_file)
+    return config, config_file, mtime
+
+def _save_config_if_dirty(config, config_file: str, dirty: bool) -> None:
+    """
+    仅在配置被修改时写回配置文件
+    
+    写入后刷新缓存中的mtime，使下一次读取直接命中缓存。
+    
+    参数:
+        config: ConfigParser对象
+        config_file (str): 配置文件路径
+        dirty (bool): 配置是否被修改过
+    """
+    if not dirty:
+        return
+    with open(config_file, 'w', encoding='utf-8') as f:
+        config.write(f)
+    _CONFIG_CACHE.update(path=config_file, mtime=os.stat(config_file).st_mtime_ns, config=config)
+
+# Resolved (pkg_path, main_path) keyed by (system, config mtime), and workbench path keyed by system
+_CURSOR_PATHS_CACHE = {}
+_WORKBENCH_PATH_CACHE = {}
+
+def _clear_cursor_paths_cache() -> None:
+    """
+    清空Cursor路径缓存
+    
+    在安装位置或配置文件被外部修改、需要强制重新探测路径时调用。
+    """
+    _CURSOR_PATHS_CACHE.clear()
+    _WORKBENCH_PATH_CACHE.clear()
+
+# Per-platform constants, resolved once at import (None on unsupported platforms)
+_PLATFORM = sys.platform
+if _PLATFORM == "win32":
+    _SECTION = "WindowsPaths"
+    _CBUTTON_OLD = r'$(k,E(Ks,{title:"Upgrade to Pro",size:"small",get codicon(){return F.rocket},get onClick(){return t.pay}}),null)'
+    _CBUTTON_NEW = r'$(k,E(Ks,{title:"yeongpin GitHub",size:"small",get codicon(){return F.rocket},get onClick(){return function(){window.open("https://github.com/yeongpin/cursor-free-vip","_blank")}}}),null)'
+    _MACHINE_ID_DEFAULT = os.path.join(os.getenv("APPDATA", ""), "Cursor", "machineId")
+    _GLOBAL_STORAGE_DIR = os.path.join(os.getenv("APPDATA"), "Cursor", "User", "globalStorage") if os.getenv("APPDATA") else None
+elif _PLATFORM == "darwin":
+    _SECTION = "MacPaths"
+    _CBUTTON_OLD = r'M(x,I(as,{title:"Upgrade to Pro",size:"small",get codicon(){return $.rocket},get onClick(){return t.pay}}),null)'
+    _CBUTTON_NEW = r'M(x,I(as,{title:"yeongpin GitHub",size:"small",get codicon(){return $.rocket},get onClick(){return function(){window.open("https://github.com/yeongpin/cursor-free-vip","_blank")}}}),null)'
+    _MACHINE_ID_DEFAULT = os.path.expanduser("~/Library/Application Support/Cursor/machineId")
+    _GLOBAL_STORAGE_DIR = os.path.abspath(os.path.expanduser("~/Library/Application Support/Cursor/User/globalStorage"))
+elif _PLATFORM == "linux":
+    _SECTION = "LinuxPaths"
+    _CBUTTON_OLD = r'$(k,E(Ks,{title:"Upgrade to Pro",size:"small",get codicon(){return F.rocket},get onClick(){return t.pay}}),null)'
+    _CBUTTON_NEW = r'$(k,E(Ks,{title:"yeongpin GitHub",size:"small",get codicon(){return F.rocket},get onClick(){return function(){window.open("https://github.com/yeongpin/cursor-free-vip","_blank")}}}),null)'
+    _MACHINE_ID_DEFAULT = os.path.expanduser("~/.config/cursor/machineid")
+    # Use the actual user's home directory when running under sudo
+    _GLOBAL_STORAGE_DIR = os.path.abspath(os.path.join(
+        f"/home/{os.environ['SUDO_USER']}" if os.environ.get('SUDO_USER') else os.path.expanduser("~"),
+        ".config/cursor/User/globalStorage"
+    ))
+else:
+    _SECTION = _CBUTTON_OLD = _CBUTTON_NEW = _MACHINE_ID_DEFAULT = _GLOBAL_STORAGE_DIR = None
+
+# Literal byte replacements applied to workbench.desktop.main.js (old -> new);
+# the JS files are patched as raw bytes so nothing outside a match is re-encoded
+_WORKBENCH_REPLACEMENTS = {}
+if _CBUTTON_OLD:
+    _WORKBENCH_REPLACEMENTS[_CBUTTON_OLD.encode("utf-8")] = _CBUTTON_NEW.encode("utf-8")
+_WORKBENCH_REPLACEMENTS[rb'<div>Pro Trial'] = rb'<div>Pro'
+_WORKBENCH_REPLACEMENTS[rb'notifications-toasts'] = rb'notifications-toasts hidden'
+
+# One alternation over all needles so the file is scanned once
+_WORKBENCH_RE = re.compile(b"|".join(map(re.escape, _WORKBENCH_REPLACEMENTS)))
+
+# getMachineId/getMacMachineId bodies in main.js; the lazy class excludes ? and } to bound backtracking
+_MAIN_JS_RE = re.compile(rb"async (getMachineId|getMacMachineId)\(\)\{return [^?}]+?\?\?([^}]+)\}")
+
+# reg.exe messages that mean the import needs administrator rights
+_REG_ACCESS_DENIED = ("Access is denied", "Error accessing the registry", "拒绝访问", "拒絕存取")
+
+# Extra diagnostics, enabled with CURSOR_FREE_VIP_DEBUG=1
+_DEBUG = bool(os.environ.get("CURSOR_FREE_VIP_DEBUG"))
+
+# Strict "x.y.z" version format
+_VERSION_RE = re.compile(r"^\d+\.\d+\.\d+$")
+
+@lru_cache(maxsize=64)
+def _parse_version(ver: str) -> Tuple[int, ...]:
+    """
+    解析版本号字符串为整数元组（结果会被缓存）
+    
+    参数:
+        ver (str): 版本号字符串，格式为"x.y.z"
+        
+    返回值:
+        Tuple[int, ...]: 版本号的整数元组表示，如(1, 2, 3)
+    """
+    return tuple(map(int, ver.split(".")))
+
+# package.json path -> (mtime, version); the file only changes when Cursor is upgraded
+_PKG_VERSION_CACHE = {}
+
+class _NotJsonObjectError(ValueError):
+    """package.json能解析但顶层不是JSON对象"""
+
+def _cached_version(pkg_path: str):
+    """
+    读取package.json中的版本号（按mtime缓存）
+    
+    参数:
+        pkg_path (str): package.json文件路径
+        
+    返回值:
+        str | None: 去除空白后的版本号，没有version字段时返回None
+        
+    异常:
+        json.JSONDecodeError: 文件不是合法的JSON时抛出
+        UnicodeDecodeError: 文件内容无法按JSON编码解码时抛出
+        _NotJsonObjectError: 顶层不是JSON对象时抛出
+    """
+    mtime = os.stat(pkg_path).st_mtime_ns
+    cached = _PKG_VERSION_CACHE.get(pkg_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    # Binary mode lets json detect the encoding itself
+    with open(pkg_path, "rb") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise _NotJsonObjectError("package.json is not a JSON object")
+    
+    version = str(data["version"]).strip() if "version" in data else None
+    _PKG_VERSION_CACHE[pkg_path] = (mtime, version)
+    return version
+
+def _batch_uuids(n: int):
+    """
+    批量生成随机UUID（版本4）
+    
+    一次os.urandom调用取出全部所需的随机字节，再切分为多个UUID，
+    代替多次调用uuid.uuid4()。
+    
+    参数:
+        n (int): 需要生成的UUID数量
+        
+    返回值:
+        list: n个uuid.UUID对象
+    """
+    data = os.urandom(16 * n)
+    return [uuid.UUID(bytes=data[i * 16:(i + 1) * 16], version=4) for i in range(n)]
+
+def _fast_backup(src: str, dst: str) -> None:
+    """
+    创建文件备份，优先使用硬链接
+    
+    同一文件系统上硬链接只增加inode引用计数，无需复制文件内容；
+    跨设备或不支持硬链接时回退到shutil.copy2。调用方随后必须通过
+    os.replace写入新文件（新inode），备份内容才不会被修改。
+    
+    参数:
+        src (str): 源文件路径
+        dst (str): 备份文件路径
+    """
+    try:
+        os.link(src, dst)
+        return
+    except FileExistsError:
+        pass
+    except OSError:
+        # Cross-device or filesystem without hard links
+        shutil.copy2(src, dst)
+        return
+    
+    # An older backup exists: link under a temporary name and rename it over the old one
+    tmp_dst = dst + ".tmp"
+    try:
+        os.link(src, tmp_dst)
+    except OSError:
+        shutil.copy2(src, dst)
+        return
+    os.replace(tmp_dst, dst)
+
 def get_cursor_paths(translator=None) -> Tuple[str, str]:
     """
     获取Cursor应用程序的重要文件路径
@@ -62,14 +319,19 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
     system = platform.system()
     
     # Read config file
-    config = configparser.ConfigParser()
-    config_dir = os.path.join(get_user_documents_path(), ".cursor-free-vip")
-    config_file = os.path.join(config_dir, "config.ini")
+    config, config_file, mtime = _get_config()
+    config_dir = os.path.dirname(config_file)
     
     # Create config directory if it doesn't exist
     if not os.path.exists(config_dir):
         os.makedirs(config_dir)
     
+    cached = _CURSOR_PATHS_CACHE.get((system, mtime))
+    if cached is not None:
+        return cached
+    
+    dirty = False
+    
     # Default paths for different systems
     default_paths = {
         "Darwin": "/Applications/Cursor.app/Contents/Resources/app",
@@ -77,26 +339,30 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
         "Linux": ["/opt/Cursor/resources/app", "/usr/share/cursor/resources/app", os.path.expanduser("~/.local/share/cursor/resources/app")]
     }
     
+    # Existence of each Linux candidate, probed once and reused below
+    exists_map = {}
+    
     if system == "Linux":
-        # Look for extracted AppImage directories - with usr structure
-        extracted_usr_paths = glob.glob(os.path.expanduser("~/squashfs-root/usr/share/cursor/resources/app"))
-        # Check current directory for extraction without home path prefix
-        current_dir_paths = glob.glob("squashfs-root/usr/share/cursor/resources/app")
+        # Look for extracted AppImage directories (home and current directory) - with usr structure
+        candidates = [os.path.expanduser("~/squashfs-root/usr/share/cursor/resources/app"),
+                      "squashfs-root/usr/share/cursor/resources/app"]
+        exists_map = {p: os.path.isdir(p) for p in default_paths["Linux"] + candidates}
         
         # Add all paths to the Linux paths list
-        default_paths["Linux"].extend(extracted_usr_paths)
-        default_paths["Linux"].extend(current_dir_paths)
+        default_paths["Linux"].extend(p for p in candidates if exists_map[p])
 
         # Print debug info for troubleshooting
-        print(f"{Fore.CYAN}{EMOJI['INFO']} Available paths found:{Style.RESET_ALL}")
-        for path in default_paths["Linux"]:
-            if os.path.exists(path):
-                print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {path} (exists){Style.RESET_ALL}")
-            else:
-                print(f"{Fore.RED}{EMOJI['ERROR']} {path} (not found){Style.RESET_ALL}")
+        if _DEBUG:
+            print(f"{Fore.CYAN}{EMOJI['INFO']} Available paths found:{Style.RESET_ALL}")
+            for path in default_paths["Linux"]:
+                if exists_map[path]:
+                    print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {path} (exists){Style.RESET_ALL}")
+                else:
+                    print(f"{Fore.RED}{EMOJI['ERROR']} {path} (not found){Style.RESET_ALL}")
     
     # If config doesn't exist, create it with default paths
-    if not os.path.exists(config_file):
+    if mtime is None:
+        dirty = True
         for section in ['MacPaths', 'WindowsPaths', 'LinuxPaths']:
             if not config.has_section(section):
                 config.add_section(section)
@@ -108,17 +374,12 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
         elif system == "Linux":
             # For Linux, try to find the first existing path
             for path in default_paths["Linux"]:
-                if os.path.exists(path):
+                if exists_map[path]:
                     config.set('LinuxPaths', 'cursor_path', path)
                     break
             else:
                 # If no path exists, use the first one as default
                 config.set('LinuxPaths', 'cursor_path', default_paths["Linux"][0])
-        
-        with open(config_file, 'w', encoding='utf-8') as f:
-            config.write(f)
-    else:
-        config.read(config_file, encoding='utf-8')
     
     # Get path based on system
     if system == "Darwin":
@@ -138,14 +399,15 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
     # For Linux, try to find the first existing path if the configured one doesn't exist
     if system == "Linux" and not os.path.exists(base_path):
         for path in default_paths["Linux"]:
-            if os.path.exists(path):
+            if exists_map[path]:
                 base_path = path
                 # Update config with the found path
                 config.set(section, 'cursor_path', path)
-                with open(config_file, 'w', encoding='utf-8') as f:
-                    config.write(f)
+                dirty = True
                 break
     
+    _save_config_if_dirty(config, config_file, dirty)
+    
     if not os.path.exists(base_path):
         raise OSError(translator.get('reset.path_not_found', path=base_path) if translator else f"找不到 Cursor 路徑: {base_path}")
     
@@ -158,6 +420,8 @@ def get_cursor_paths(translator=None) -> Tuple[str, str]:
     if not os.path.exists(main_path):
         raise OSError(translator.get('reset.main_not_found', path=main_path) if translator else f"找不到 main.js: {main_path}")
     
+    # Key on the mtime after any write above so the next call hits the cache
+    _CURSOR_PATHS_CACHE[(system, _config_mtime(config_file))] = (pkg_path, main_path)
     return (pkg_path, main_path)
 
 def get_cursor_machine_id_path(translator=None) -> str:
@@ -177,40 +441,22 @@ def get_cursor_machine_id_path(translator=None) -> str:
         OSError: 当不支持的操作系统时抛出
     """
     # Read configuration
-    config_dir = os.path.join(get_user_documents_path(), ".cursor-free-vip")
-    config_file = os.path.join(config_dir, "config.ini")
-    config = configparser.ConfigParser()
-    
-    if os.path.exists(config_file):
-        config.read(config_file)
+    config, config_file, mtime = _get_config()
     
-    if sys.platform == "win32":  # Windows
-        if not config.has_section('WindowsPaths'):
-            config.add_section('WindowsPaths')
-            config.set('WindowsPaths', 'machine_id_path', 
-                os.path.join(os.getenv("APPDATA"), "Cursor", "machineId"))
-        return config.get('WindowsPaths', 'machine_id_path')
-        
-    elif sys.platform == "linux":  # Linux
-        if not config.has_section('LinuxPaths'):
-            config.add_section('LinuxPaths')
-            config.set('LinuxPaths', 'machine_id_path',
-                os.path.expanduser("~/.config/cursor/machineid"))
-        return config.get('LinuxPaths', 'machine_id_path')
-        
-    elif sys.platform == "darwin":  # macOS
-        if not config.has_section('MacPaths'):
-            config.add_section('MacPaths')
-            config.set('MacPaths', 'machine_id_path',
-                os.path.expanduser("~/Library/Application Support/Cursor/machineId"))
-        return config.get('MacPaths', 'machine_id_path')
-        
-    else:
+    if _SECTION is None:
         raise OSError(f"Unsupported operating system: {sys.platform}")
-
-    # Save any changes to config file
-    with open(config_file, 'w', encoding='utf-8') as f:
-        config.write(f)
+    
+    if config.has_option(_SECTION, 'machine_id_path'):
+        return config.get(_SECTION, 'machine_id_path')
+    
+    # Persist the default once; a missing config file is left for get_cursor_paths to create
+    machine_id_path = _MACHINE_ID_DEFAULT
+    if mtime is not None:
+        if not config.has_section(_SECTION):
+            config.add_section(_SECTION)
+        config.set(_SECTION, 'machine_id_path', machine_id_path)
+        _save_config_if_dirty(config, config_file, True)
+    return machine_id_path
 
 def get_workbench_cursor_path(translator=None) -> str:
     """
@@ -230,6 +476,10 @@ def get_workbench_cursor_path(translator=None) -> str:
     """
     system = platform.system()
     
+    cached = _WORKBENCH_PATH_CACHE.get(system)
+    if cached is not None:
+        return cached
+    
     paths_map = {
         "Darwin": {  # macOS
             "base": "/Applications/Cursor.app/Contents/Resources/app",
@@ -246,18 +496,16 @@ def get_workbench_cursor_path(translator=None) -> str:
     }
 
     if system == "Linux":
-        # Look for extracted AppImage with correct usr structure
-        extracted_usr_paths = glob.glob(os.path.expanduser("~/squashfs-root/usr/share/cursor/resources/app"))
-        # Check current directory for extraction
-        current_dir_paths = glob.glob("squashfs-root/usr/share/cursor/resources/app")
-  
+        # Look for extracted AppImage (home and current directory) with correct usr structure
+        candidates = [os.path.expanduser("~/squashfs-root/usr/share/cursor/resources/app"),
+                      "squashfs-root/usr/share/cursor/resources/app"]
         
-        paths_map["Linux"]["bases"].extend(extracted_usr_paths)
-        paths_map["Linux"]["bases"].extend(current_dir_paths)
+        paths_map["Linux"]["bases"].extend(p for p in candidates if os.path.isdir(p))
 
         for base in paths_map["Linux"]["bases"]:
             main_path = os.path.join(base, paths_map["Linux"]["main"])
             if os.path.exists(main_path):
+                _WORKBENCH_PATH_CACHE[system] = main_path
                 return main_path
         raise OSError(translator.get('reset.linux_path_not_found') if translator else "在 Linux 系统上未找到 Cursor 安装路径")
 
@@ -267,6 +515,7 @@ def get_workbench_cursor_path(translator=None) -> str:
     if not os.path.exists(main_path):
         raise OSError(translator.get('reset.file_not_found', path=main_path) if translator else f"未找到 Cursor main.js 文件: {main_path}")
         
+    _WORKBENCH_PATH_CACHE[system] = main_path
     return main_path
 
 def version_check(version: str, min_version: str = "", max_version: str = "", translator=None) -> bool:
@@ -285,31 +534,18 @@ def version_check(version: str, min_version: str = "", max_version: str = "", tr
     返回值:
         bool: 版本检查通过返回True，否则返回False
     """
-    version_pattern = r"^\d+\.\d+\.\d+$"
     try:
-        if not re.match(version_pattern, version):
+        if not _VERSION_RE.match(version):
             print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.invalid_version_format', version=version)}{Style.RESET_ALL}")
             return False
 
-        def parse_version(ver: str) -> Tuple[int, ...]:
-            """
-            解析版本号字符串为整数元组
-            
-            参数:
-                ver (str): 版本号字符串，格式为"x.y.z"
-                
-            返回值:
-                Tuple[int, ...]: 版本号的整数元组表示，如(1, 2, 3)
-            """
-            return tuple(map(int, ver.split(".")))
-
-        current = parse_version(version)
+        current = _parse_version(version)
 
-        if min_version and current < parse_version(min_version):
+        if min_version and current < _parse_version(min_version):
             print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.version_too_low', version=version, min_version=min_version)}{Style.RESET_ALL}")
             return False
 
-        if max_version and current > parse_version(max_version):
+        if max_version and current > _parse_version(max_version):
             print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.version_too_high', version=version, max_version=max_version)}{Style.RESET_ALL}")
             return False
 
@@ -337,23 +573,11 @@ def check_cursor_version(translator) -> bool:
         pkg_path, _ = get_cursor_paths(translator)
         print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.reading_package_json', path=pkg_path)}{Style.RESET_ALL}")
         
-        try:
-            with open(pkg_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except UnicodeDecodeError:
-            # If UTF-8 reading fails, try other encodings
-            with open(pkg_path, "r", encoding="latin-1") as f:
-                data = json.load(f)
-                
-        if not isinstance(data, dict):
-            print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.invalid_json_object')}{Style.RESET_ALL}")
-            return False
-            
-        if "version" not in data:
+        version = _cached_version(pkg_path)
+        if version is None:
             print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.no_version_field')}{Style.RESET_ALL}")
             return False
             
-        version = str(data["version"]).strip()
         if not version:
             print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.version_field_empty')}{Style.RESET_ALL}")
             return False
@@ -361,13 +585,13 @@ def check_cursor_version(translator) -> bool:
         print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.found_version', version=version)}{Style.RESET_ALL}")
         
         # Check version format
-        if not re.match(r"^\d+\.\d+\.\d+$", version):
+        if not _VERSION_RE.match(version):
             print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.invalid_version_format', version=version)}{Style.RESET_ALL}")
             return False
             
         # Compare versions
         try:
-            current = tuple(map(int, version.split(".")))
+            current = _parse_version(version)
             min_ver = (0, 45, 0)  # Use tuple directly instead of string
             
             if current >= min_ver:
@@ -383,7 +607,8 @@ def check_cursor_version(translator) -> bool:
     except FileNotFoundError as e:
         print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.package_not_found', path=pkg_path)}{Style.RESET_ALL}")
         return False
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError, _NotJsonObjectError) as e:
+        # Undecodable bytes mean a corrupted package.json; fail instead of guessing an encoding
         print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.invalid_json_object')}{Style.RESET_ALL}")
         return False
     except Exception as e:
@@ -413,48 +638,24 @@ def modify_workbench_js(file_path: str, translator=None) -> bool:
         original_uid = original_stat.st_uid
         original_gid = original_stat.st_gid
 
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", errors="ignore", delete=False) as tmp_file:
-            # Read original content
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as main_file:
-                content = main_file.read()
-
-            if sys.platform == "win32":
-                # Define replacement patterns
-                CButton_old_pattern = r'$(k,E(Ks,{title:"Upgrade to Pro",size:"small",get codicon(){return F.rocket},get onClick(){return t.pay}}),null)'
-                CButton_new_pattern = r'$(k,E(Ks,{title:"yeongpin GitHub",size:"small",get codicon(){return F.rocket},get onClick(){return function(){window.open("https://github.com/yeongpin/cursor-free-vip","_blank")}}}),null)'
-            elif sys.platform == "linux":
-                CButton_old_pattern = r'$(k,E(Ks,{title:"Upgrade to Pro",size:"small",get codicon(){return F.rocket},get onClick(){return t.pay}}),null)'
-                CButton_new_pattern = r'$(k,E(Ks,{title:"yeongpin GitHub",size:"small",get codicon(){return F.rocket},get onClick(){return function(){window.open("https://github.com/yeongpin/cursor-free-vip","_blank")}}}),null)'
-            elif sys.platform == "darwin":
-                CButton_old_pattern = r'M(x,I(as,{title:"Upgrade to Pro",size:"small",get codicon(){return $.rocket},get onClick(){return t.pay}}),null)'
-                CButton_new_pattern = r'M(x,I(as,{title:"yeongpin GitHub",size:"small",get codicon(){return $.rocket},get onClick(){return function(){window.open("https://github.com/yeongpin/cursor-free-vip","_blank")}}}),null)'
-
-            CBadge_old_pattern = r'<div>Pro Trial'
-            CBadge_new_pattern = r'<div>Pro'
-
-            CToast_old_pattern = r'notifications-toasts'
-            CToast_new_pattern = r'notifications-toasts hidden'
+        # Read original content as bytes
+        with open(file_path, "rb") as f:
+            content = f.read()
 
-            # Replace content
-            content = content.replace(CButton_old_pattern, CButton_new_pattern)
-            content = content.replace(CBadge_old_pattern, CBadge_new_pattern)
-            content = content.replace(CToast_old_pattern, CToast_new_pattern)
+        # Replace content in a single pass
+        content = _WORKBENCH_RE.sub(lambda m: _WORKBENCH_REPLACEMENTS[m.group(0)], content)
 
-            # Write to temporary file
-            tmp_file.write(content)
+        # Write to a temporary file next to the target so the final rename stays on one filesystem
+        with tempfile.NamedTemporaryFile(mode="wb", dir=os.path.dirname(file_path), delete=False) as tmp_file:
             tmp_path = tmp_file.name
+            tmp_file.write(content)
 
         # Backup original file
         backup_path = file_path + ".backup"
-        if os.path.exists(backup_path):
-            os.remove(backup_path)
-        shutil.copy2(file_path, backup_path)
+        _fast_backup(file_path, backup_path)
         
-        # Move temporary file to original position
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        shutil.move(tmp_path, file_path)
+        # Atomically replace the original file
+        os.replace(tmp_path, file_path)
 
         # Restore original permissions
         os.chmod(file_path, original_mode)
@@ -466,14 +667,15 @@ def modify_workbench_js(file_path: str, translator=None) -> bool:
 
     except Exception as e:
         print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.modify_file_failed', error=str(e))}{Style.RESET_ALL}")
+        # The temp file no longer exists once os.replace has consumed it
         if "tmp_path" in locals():
             try:
                 os.unlink(tmp_path)
-            except:
+            except FileNotFoundError:
                 pass
         return False
 
-def modify_main_js(main_path: str, translator) -> bool:
+def modify_main_js(main_path: str, translator, skip_backup: bool = False) -> bool:
     """
     修改Cursor主JS文件
     
@@ -483,6 +685,7 @@ def modify_main_js(main_path: str, translator) -> bool:
     参数:
         main_path (str): main.js文件的路径
         translator: 翻译器对象，用于多语言支持
+        skip_backup (bool): 调用方已备份原始文件时为True，跳过.old备份
         
     返回值:
         bool: 修改成功返回True，否则返回False
@@ -493,23 +696,20 @@ def modify_main_js(main_path: str, translator) -> bool:
         original_uid = original_stat.st_uid
         original_gid = original_stat.st_gid
 
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as tmp_file:
-            with open(main_path, "r", encoding="utf-8") as main_file:
-                content = main_file.read()
+        with open(main_path, "rb") as f:
+            content = f.read()
 
-            patterns = {
-                r"async getMachineId\(\)\{return [^??]+\?\?([^}]+)\}": r"async getMachineId(){return \1}",
-                r"async getMacMachineId\(\)\{return [^??]+\?\?([^}]+)\}": r"async getMacMachineId(){return \1}",
-            }
+        content, count = _MAIN_JS_RE.subn(lambda m: b"async " + m.group(1) + b"(){return " + m.group(2) + b"}", content)
+        if _DEBUG and not count:
+            print(f"{Fore.YELLOW}{EMOJI['WARNING']} getMachineId pattern not found in {main_path}{Style.RESET_ALL}")
 
-            for pattern, replacement in patterns.items():
-                content = re.sub(pattern, replacement, content)
-
-            tmp_file.write(content)
+        with tempfile.NamedTemporaryFile(mode="wb", dir=os.path.dirname(main_path), delete=False) as tmp_file:
             tmp_path = tmp_file.name
+            tmp_file.write(content)
 
-        shutil.copy2(main_path, main_path + ".old")
-        shutil.move(tmp_path, main_path)
+        if not skip_backup:
+            _fast_backup(main_path, main_path + ".old")
+        os.replace(tmp_path, main_path)
 
         os.chmod(main_path, original_mode)
         if os.name != "nt":
@@ -520,8 +720,12 @@ def modify_main_js(main_path: str, translator) -> bool:
 
     except Exception as e:
         print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.modify_file_failed', error=str(e))}{Style.RESET_ALL}")
+        # The temp file no longer exists once os.replace has consumed it
         if "tmp_path" in locals():
-            os.unlink(tmp_path)
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
         return False
 
 def patch_cursor_get_machine_id(translator) -> bool:
@@ -554,8 +758,9 @@ def patch_cursor_get_machine_id(translator) -> bool:
 
         # Get version number
         try:
-            with open(pkg_path, "r", encoding="utf-8") as f:
-                version = json.load(f)["version"]
+            version = _cached_version(pkg_path)
+            if version is None:
+                raise KeyError("version")
             print(f"{Fore.CYAN}{EMOJI['INFO']} {translator.get('reset.current_version', version=version)}{Style.RESET_ALL}")
         except Exception as e:
             print(f"{Fore.RED}{EMOJI['ERROR']} {translator.get('reset.read_version_failed', error=str(e))}{Style.RESET_ALL}")
@@ -570,12 +775,14 @@ def patch_cursor_get_machine_id(translator) -> bool:
 
         # Backup file
         backup_path = main_path + ".bak"
+        backup_made = False
         if not os.path.exists(backup_path):
-            shutil.copy2(main_path, backup_path)
+            _fast_backup(main_path, backup_path)
+            backup_made = True
             print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {translator.get('reset.backup_created', path=backup_path)}{Style.RESET_ALL}")
 
         # Modify file
-        if not modify_main_js(main_path, translator):
+        if not modify_main_js(main_path, translator, skip_backup=backup_made):
             return False
 
         print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {translator.get('reset.patch_completed')}{Style.RESET_ALL}")
@@ -610,71 +817,35 @@ class MachineIDResetter:
         self.translator = translator
 
         # Read configuration
-        config_dir = os.path.join(get_user_documents_path(), ".cursor-free-vip")
-        config_file = os.path.join(config_dir, "config.ini")
-        config = configparser.ConfigParser()
+        config, config_file, mtime = _get_config()
         
-        if not os.path.exists(config_file):
+        if mtime is None:
             raise FileNotFoundError(f"Config file not found: {config_file}")
         
-        config.read(config_file, encoding='utf-8')
+        dirty = False
 
         # Check operating system
-        if sys.platform == "win32":  # Windows
-            appdata = os.getenv("APPDATA")
-            if appdata is None:
+        if _SECTION is None:
+            raise NotImplementedError(f"Not Supported OS: {sys.platform}")
+        
+        if not config.has_section(_SECTION):
+            if _GLOBAL_STORAGE_DIR is None:
                 raise EnvironmentError("APPDATA Environment Variable Not Set")
+            config.add_section(_SECTION)
+            dirty = True
+            config.set(_SECTION, 'storage_path', os.path.join(_GLOBAL_STORAGE_DIR, "storage.json"))
+            config.set(_SECTION, 'sqlite_path', os.path.join(_GLOBAL_STORAGE_DIR, "state.vscdb"))
             
-            if not config.has_section('WindowsPaths'):
-                config.add_section('WindowsPaths')
-                config.set('WindowsPaths', 'storage_path', os.path.join(
-                    appdata, "Cursor", "User", "globalStorage", "storage.json"
-                ))
-                config.set('WindowsPaths', 'sqlite_path', os.path.join(
-                    appdata, "Cursor", "User", "globalStorage", "state.vscdb"
-                ))
-                
-            self.db_path = config.get('WindowsPaths', 'storage_path')
-            self.sqlite_path = config.get('WindowsPaths', 'sqlite_path')
-            
-        elif sys.platform == "darwin":  # macOS
-            if not config.has_section('MacPaths'):
-                config.add_section('MacPaths')
-                config.set('MacPaths', 'storage_path', os.path.abspath(os.path.expanduser(
-                    "~/Library/Application Support/Cursor/User/globalStorage/storage.json"
-                )))
-                config.set('MacPaths', 'sqlite_path', os.path.abspath(os.path.expanduser(
-                    "~/Library/Application Support/Cursor/User/globalStorage/state.vscdb"
-                )))
-                
-            self.db_path = config.get('MacPaths', 'storage_path')
-            self.sqlite_path = config.get('MacPaths', 'sqlite_path')
-            
-        elif sys.platform == "linux":  # Linux
-            if not config.has_section('LinuxPaths'):
-                config.add_section('LinuxPaths')
-                # Get actual user's home directory
-                sudo_user = os.environ.get('SUDO_USER')
-                actual_home = f"/home/{sudo_user}" if sudo_user else os.path.expanduser("~")
-                
-                config.set('LinuxPaths', 'storage_path', os.path.abspath(os.path.join(
-                    actual_home,
-                    ".config/cursor/User/globalStorage/storage.json"
-                )))
-                config.set('LinuxPaths', 'sqlite_path', os.path.abspath(os.path.join(
-                    actual_home,
-                    ".config/cursor/User/globalStorage/state.vscdb"
-                )))
-                
-            self.db_path = config.get('LinuxPaths', 'storage_path')
-            self.sqlite_path = config.get('LinuxPaths', 'sqlite_path')
-            
-        else:
-            raise NotImplementedError(f"Not Supported OS: {sys.platform}")
+        self.db_path = config.get(_SECTION, 'storage_path')
+        self.sqlite_path = config.get(_SECTION, 'sqlite_path')
+
+        # storage.json path -> (mtime_ns, parsed data)
+        self._config_cache = {}
+        # HKLM subkey -> open write handle, reused across updates and closed in __del__
+        self._reg_handles = {}
 
         # Save any changes to config file
-        with open(config_file, 'w', encoding='utf-8') as f:
-            config.write(f)
+        _save_config_if_dirty(config, config_file, dirty)
 
     def generate_new_ids(self):
         """
@@ -687,16 +858,17 @@ class MachineIDResetter:
             dict: 包含各种新生成ID的字典，键为ID名称，值为ID值
         """
         # Generate new UUID
-        dev_device_id = str(uuid.uuid4())
+        dev_uuid, sqm_uuid = _batch_uuids(2)
+        dev_device_id = str(dev_uuid)
 
         # Generate new machineId (64 characters of hexadecimal)
-        machine_id = hashlib.sha256(os.urandom(32)).hexdigest()
+        machine_id = os.urandom(32).hex()
 
         # Generate new macMachineId (128 characters of hexadecimal)
-        mac_machine_id = hashlib.sha512(os.urandom(64)).hexdigest()
+        mac_machine_id = os.urandom(64).hex()
 
         # Generate new sqmId
-        sqm_id = "{" + str(uuid.uuid4()).upper() + "}"
+        sqm_id = "{" + str(sqm_uuid).upper() + "}"
 
         self.update_machine_id_file(dev_device_id)
 
@@ -725,29 +897,33 @@ class MachineIDResetter:
         try:
             print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.updating_sqlite')}...{Style.RESET_ALL}")
             
-            conn = sqlite3.connect(self.sqlite_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ItemTable (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
-                )
-            """)
-
-            updates = [
-                (key, value) for key, value in new_ids.items()
-            ]
-
-            for key, value in updates:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO ItemTable (key, value) 
-                    VALUES (?, ?)
-                """, (key, value))
-                print(f"{EMOJI['INFO']} {Fore.CYAN} {self.translator.get('reset.updating_pair')}: {key}{Style.RESET_ALL}")
-
-            conn.commit()
-            conn.close()
+            # Manage the transaction explicitly so the schema check and all rows share one commit
+            conn = sqlite3.connect(self.sqlite_path, isolation_level=None)
+            try:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS ItemTable (
+                            key TEXT PRIMARY KEY,
+                            value TEXT
+                        )
+                    """)
+
+                    cursor.executemany("""
+                        INSERT OR REPLACE INTO ItemTable (key, value) 
+                        VALUES (?, ?)
+                    """, list(new_ids.items()))
+
+                    cursor.execute("COMMIT")
+                except Exception:
+                    cursor.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+            print(f"{EMOJI['INFO']} {Fore.CYAN} {self.translator.get('reset.updating_pair')}: {', '.join(new_ids)}{Style.RESET_ALL}")
             print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.sqlite_success')}{Style.RESET_ALL}")
             return True
 
@@ -773,8 +949,19 @@ class MachineIDResetter:
             print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.updating_system_ids')}...{Style.RESET_ALL}")
             
             if sys.platform.startswith("win"):
-                self._update_windows_machine_guid()
-                self._update_windows_machine_id()
+                guid, machine_id = _batch_uuids(2)
+                new_guid = str(guid)
+                new_machine_id = "{" + str(machine_id).upper() + "}"
+                try:
+                    self._update_windows_registry_batch(new_guid, new_machine_id)
+                except PermissionError as e:
+                    print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.permission_denied', error=str(e))}{Style.RESET_ALL}")
+                    print(f"{Fore.YELLOW}{EMOJI['WARNING']} {self.translator.get('reset.run_as_admin')}{Style.RESET_ALL}")
+                    raise
+                except (FileNotFoundError, subprocess.CalledProcessError):
+                    # reg.exe missing or the import failed, update the keys one by one through winreg
+                    self._update_windows_machine_guid(new_guid)
+                    self._update_windows_machine_id(new_machine_id)
             elif sys.platform == "darwin":
                 self._update_macos_platform_uuid(new_ids)
                 
@@ -784,28 +971,109 @@ class MachineIDResetter:
             print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.system_ids_update_failed', error=str(e))}{Style.RESET_ALL}")
             return False
 
-    def _update_windows_machine_guid(self):
+    def _open_hklm(self, subkey: str, create: bool = False):
+        """
+        获取HKLM子键的可写句柄（打开后缓存复用）
+        
+        参数:
+            subkey (str): HKEY_LOCAL_MACHINE下的子键路径
+            create (bool): 为True时使用CreateKeyEx，子键不存在会被创建
+            
+        返回值:
+            PyHKEY: 以KEY_WRITE | KEY_WOW64_64KEY打开的注册表句柄
+            
+        异常:
+            FileNotFoundError: 当子键不存在且create为False时抛出
+            PermissionError: 当没有足够权限访问注册表时抛出
+        """
+        key = self._reg_handles.get(subkey)
+        if key is None:
+            import winreg
+            # CreateKeyEx opens an existing key or creates it in one call
+            open_key = winreg.CreateKeyEx if create else winreg.OpenKey
+            key = open_key(
+                winreg.HKEY_LOCAL_MACHINE,
+                subkey,
+                0,
+                winreg.KEY_WRITE | winreg.KEY_WOW64_64KEY
+            )
+            self._reg_handles[subkey] = key
+        return key
+
+    def __del__(self):
+        """
+        关闭缓存的注册表句柄
+        """
+        for key in getattr(self, "_reg_handles", {}).values():
+            try:
+                key.Close()
+            except Exception:
+                pass
+
+    def _update_windows_registry_batch(self, new_guid: str, new_machine_id: str):
+        """
+        批量更新Windows注册表中的机器ID
+        
+        将Cryptography\\MachineGuid和SQMClient\\MachineId写入同一个临时.reg文件，
+        通过一次reg import完成两处更新。需要管理员权限。
+        
+        参数:
+            new_guid (str): 新的MachineGuid
+            new_machine_id (str): 新的SQMClient MachineId，格式为"{GUID}"
+            
+        异常:
+            FileNotFoundError: 当系统中找不到reg.exe时抛出
+            PermissionError: 当reg import因权限不足失败时抛出
+            subprocess.CalledProcessError: 当reg import因其他原因失败时抛出
+        """
+        content = (
+            "Windows Registry Editor Version 5.00\n\n"
+            "[HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\Cryptography]\n"
+            f'"MachineGuid"="{new_guid}"\n\n'
+            "[HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\SQMClient]\n"
+            f'"MachineId"="{new_machine_id}"\n'
+        )
+        # reg import expects UTF-16 with a BOM for version 5.00 files
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".reg", encoding="utf-16", delete=False) as reg_file:
+            reg_file.write(content)
+            reg_path = reg_file.name
+
+        try:
+            print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.new_machine_id')}: {new_machine_id}{Style.RESET_ALL}")
+            subprocess.run(
+                ["reg", "import", reg_path, "/reg:64"],
+                check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+            )
+        except subprocess.CalledProcessError as e:
+            # reg.exe writes its messages in the console (OEM) code page
+            stderr = e.stderr.decode("oem", errors="replace").strip() if e.stderr else ""
+            if any(marker in stderr for marker in _REG_ACCESS_DENIED):
+                raise PermissionError(stderr) from e
+            raise
+        finally:
+            os.unlink(reg_path)
+
+        print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.windows_machine_guid_updated')}{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.windows_machine_id_updated')}{Style.RESET_ALL}")
+
+    def _update_windows_machine_guid(self, new_guid: str = None):
         """
         更新Windows MachineGuid
         
         在Windows注册表中更新加密模块使用的MachineGuid值，
         这个值常被应用程序用于识别Windows设备。需要管理员权限。
         
+        参数:
+            new_guid (str): 预先生成的新GUID，为None时自动生成
+        
         异常:
             PermissionError: 当没有足够权限访问注册表时抛出
             Exception: 其他更新失败时抛出
         """
         try:
             import winreg
-            key = winreg.OpenKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                "SOFTWARE\\Microsoft\\Cryptography",
-                0,
-                winreg.KEY_WRITE | winreg.KEY_WOW64_64KEY
-            )
-            new_guid = str(uuid.uuid4())
-            winreg.SetValueEx(key, "MachineGuid", 0, winreg.REG_SZ, new_guid)
-            winreg.CloseKey(key)
+            new_guid = new_guid or str(uuid.uuid4())
+            winreg.SetValueEx(self._open_hklm("SOFTWARE\\Microsoft\\Cryptography"), "MachineGuid", 0, winreg.REG_SZ, new_guid)
             print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.windows_machine_guid_updated')}{Style.RESET_ALL}")
         except PermissionError:
             print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.permission_denied')}{Style.RESET_ALL}")
@@ -814,7 +1082,7 @@ class MachineIDResetter:
             print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.update_windows_machine_guid_failed', error=str(e))}{Style.RESET_ALL}")
             raise
     
-    def _update_windows_machine_id(self):
+    def _update_windows_machine_id(self, new_guid: str = None):
         """
         更新Windows SQMClient MachineId
         
@@ -822,33 +1090,23 @@ class MachineIDResetter:
         这个值通常用于软件质量监测和遥测系统。如果注册表项
         不存在，会创建相应的项。需要管理员权限。
         
+        参数:
+            new_guid (str): 预先生成的"{GUID}"格式新ID，为None时自动生成
+        
         返回值:
             bool: 更新成功返回True，失败返回False
         """
         try:
             import winreg
-            # 1. Generate new GUID
-            new_guid = "{" + str(uuid.uuid4()).upper() + "}"
+            # 1. Generate new GUID unless the caller supplied one
+            new_guid = new_guid or "{" + str(uuid.uuid4()).upper() + "}"
             print(f"{Fore.CYAN}{EMOJI['INFO']} {self.translator.get('reset.new_machine_id')}: {new_guid}{Style.RESET_ALL}")
             
-            # 2. Open the registry key
-            try:
-                key = winreg.OpenKey(
-                    winreg.HKEY_LOCAL_MACHINE,
-                    r"SOFTWARE\Microsoft\SQMClient",
-                    0,
-                    winreg.KEY_WRITE | winreg.KEY_WOW64_64KEY
-                )
-            except FileNotFoundError:
-                # If the key does not exist, create it
-                key = winreg.CreateKey(
-                    winreg.HKEY_LOCAL_MACHINE,
-                    r"SOFTWARE\Microsoft\SQMClient"
-                )
+            # 2. Open the registry key, creating it if it does not exist
+            key = self._open_hklm(r"SOFTWARE\Microsoft\SQMClient", create=True)
             
             # 3. Set MachineId value
             winreg.SetValueEx(key, "MachineId", 0, winreg.REG_SZ, new_guid)
-            winreg.CloseKey(key)
             
             print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.windows_machine_id_updated')}{Style.RESET_ALL}")
             return True
@@ -879,17 +1137,40 @@ class MachineIDResetter:
         try:
             uuid_file = "/var/root/Library/Preferences/SystemConfiguration/com.apple.platform.uuid.plist"
             if os.path.exists(uuid_file):
-                # Use sudo to execute plutil command
-                cmd = f'sudo plutil -replace "UUID" -string "{new_ids["telemetry.macMachineId"]}" "{uuid_file}"'
-                result = os.system(cmd)
-                if result == 0:
-                    print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.macos_platform_uuid_updated')}{Style.RESET_ALL}")
-                else:
-                    raise Exception(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.failed_to_execute_plutil_command')}{Style.RESET_ALL}")
+                # Use sudo to execute plutil command; argv is passed straight to exec, no shell involved
+                try:
+                    subprocess.run(
+                        ["sudo", "plutil", "-replace", "UUID", "-string", new_ids["telemetry.macMachineId"], uuid_file],
+                        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+                    )
+                except subprocess.CalledProcessError as e:
+                    stderr = e.stderr.decode(errors="replace").strip() if e.stderr else ""
+                    raise Exception(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.failed_to_execute_plutil_command')}: {stderr}{Style.RESET_ALL}")
+                print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.macos_platform_uuid_updated')}{Style.RESET_ALL}")
         except Exception as e:
             print(f"{Fore.RED}{EMOJI['ERROR']} {self.translator.get('reset.update_macos_platform_uuid_failed', error=str(e))}{Style.RESET_ALL}")
             raise
 
+    def _load_storage_config(self) -> dict:
+        """
+        读取storage.json（按mtime缓存）
+        
+        文件自上次读取或写入后未变化时直接返回缓存的字典，
+        避免同一进程内重复解析。
+        
+        返回值:
+            dict: storage.json的内容，与缓存共享，调用方不得原地修改
+        """
+        mtime = os.stat(self.db_path).st_mtime_ns
+        cached = self._config_cache.get(self.db_path)
+        if cached is None or cached[0] != mtime:
+            # Read raw bytes and let the parser decode them, skipping the text IO layer
+            with open(self.db_path, "rb") as f:
+                raw = f.read()
+            cached = (mtime, orjson.loads(raw) if orjson is not None else json.loads(raw))
+            self._config_cache[self.db_path] = cached
+        return cached[1]
+
     def reset_machine_ids(self):
         """
         重置所有机器ID
@@ -918,25 +1199,29 @@ class MachineIDResetter:
                 return False
 
             print(f"{Fore.CYAN}{EMOJI['FILE']} {self.translator.get('reset.reading')}...{Style.RESET_ALL}")
-            with open(self.db_path, "r", encoding="utf-8") as f:
-                config = json.load(f)
+            config = self._load_storage_config()
 
             backup_path = self.db_path + ".bak"
             if not os.path.exists(backup_path):
                 print(f"{Fore.YELLOW}{EMOJI['BACKUP']} {self.translator.get('reset.creating_backup')}: {backup_path}{Style.RESET_ALL}")
-                shutil.copy2(self.db_path, backup_path)
+                shutil.copyfile(self.db_path, backup_path)
             else:
                 print(f"{Fore.YELLOW}{EMOJI['INFO']} {self.translator.get('reset.backup_exists')}{Style.RESET_ALL}")
 
             print(f"{Fore.CYAN}{EMOJI['RESET']} {self.translator.get('reset.generating')}...{Style.RESET_ALL}")
             new_ids = self.generate_new_ids()
 
-            # Update configuration file
-            config.update(new_ids)
+            # Build the updated configuration as a new dict, leaving the cached one untouched
+            config = {**config, **new_ids}
 
             print(f"{Fore.CYAN}{EMOJI['FILE']} {self.translator.get('reset.saving_json')}...{Style.RESET_ALL}")
-            with open(self.db_path, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=4)
+            if orjson is not None:
+                data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config, indent=2, ensure_ascii=False).encode("utf-8")
+            with open(self.db_path, "wb") as f:
+                f.write(data)
+            self._config_cache[self.db_path] = (os.stat(self.db_path).st_mtime_ns, config)
 
             # Update SQLite database
             self.update_sqlite_db(new_ids)
@@ -958,10 +1243,14 @@ class MachineIDResetter:
             else:
                 print(f"{Fore.YELLOW}{EMOJI['INFO']} {self.translator.get('reset.version_less_than_0_45')}{Style.RESET_ALL}")
 
-            print(f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.success')}{Style.RESET_ALL}")
-            print(f"\n{Fore.CYAN}{self.translator.get('reset.new_id')}:{Style.RESET_ALL}")
-            for key, value in new_ids.items():
-                print(f"{EMOJI['INFO']} {key}: {Fore.GREEN}{value}{Style.RESET_ALL}")
+            # Emit the success banner and the new IDs as one write
+            lines = [
+                f"{Fore.GREEN}{EMOJI['SUCCESS']} {self.translator.get('reset.success')}{Style.RESET_ALL}",
+                f"\n{Fore.CYAN}{self.translator.get('reset.new_id')}:{Style.RESET_ALL}",
+            ]
+            lines.extend(f"{EMOJI['INFO']} {key}: {Fore.GREEN}{value}{Style.RESET_ALL}" for key, value in new_ids.items())
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
 
             return True
 
@@ -997,7 +1286,7 @@ class MachineIDResetter:
             if os.path.exists(machine_id_path):
                 backup_path = machine_id_path + ".backup"
                 try:
-                    shutil.copy2(machine_id_path, backup_path)
+                    shutil.copyfile(machine_id_path, backup_path)
                     print(f"{Fore.GREEN}{EMOJI['INFO']} {self.translator.get('reset.backup_created', path=backup_path) if self.translator else f'Backup created at: {backup_path}'}{Style.RESET_ALL}")
                 except Exception as e:
                     print(f"{Fore.YELLOW}{EMOJI['INFO']} {self.translator.get('reset.backup_creation_failed', error=str(e)) if self.translator else f'Could not create backup: {str(e)}'}{Style.RESET_ALL}")
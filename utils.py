@@ -10,8 +10,13 @@ utils.py - 实用工具函数集合
 """
 import os
 import sys
-import platform
 import random
+from functools import lru_cache
+
+# Platform facts are fixed for the process lifetime, resolve them once
+_IS_WIN = sys.platform == "win32"
+_IS_MAC = sys.platform == "darwin"
+_DOCS = os.path.expanduser("~\\Documents" if _IS_WIN else "~/Documents")
 
 def get_user_documents_path():
     """
@@ -24,11 +29,9 @@ def get_user_documents_path():
     返回值:
         str: 用户文档目录的完整路径
     """
-    if platform.system() == "Windows":
-        return os.path.expanduser("~\\Documents")
-    else:
-        return os.path.expanduser("~/Documents")
+    return _DOCS
 
+@lru_cache(maxsize=1)
 def get_default_chrome_path():
     """
     获取默认Chrome浏览器可执行文件路径。
@@ -41,7 +44,7 @@ def get_default_chrome_path():
     返回值:
         str: Chrome可执行文件的完整路径
     """
-    if sys.platform == "win32":
+    if _IS_WIN:
         #  Trying to find chrome in PATH
         try:
             import shutil
@@ -52,11 +55,28 @@ def get_default_chrome_path():
             pass
         # Going to default path
         return r"C:\Program Files\Google\Chrome\Application\chrome.exe"
-    elif sys.platform == "darwin":
+    elif _IS_MAC:
         return "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
     else:
         return "/usr/bin/google-chrome"
 
+@lru_cache(maxsize=None)
+def _listdir(parent):
+    """
+    列出目录中的条目名称（结果会被缓存）。
+    
+    参数:
+        parent (str): 目录路径
+        
+    返回值:
+        frozenset: 目录中的条目名称，目录不存在或无法读取时为空集合
+    """
+    try:
+        return frozenset(os.listdir(parent))
+    except OSError:
+        return frozenset()
+
+@lru_cache(maxsize=1)
 def get_linux_cursor_path():
     """
     获取Linux系统上Cursor应用程序的资源路径。
@@ -71,16 +91,46 @@ def get_linux_cursor_path():
     返回值:
         str: 找到的第一个存在的Cursor资源路径，如果都不存在则返回默认路径
     """
-    possible_paths = [
-        "/opt/Cursor/resources/app",
-        "/usr/share/cursor/resources/app",
-        "/opt/cursor-bin/resources/app",
-        "/usr/lib/cursor/resources/app",
-        os.path.expanduser("~/.local/share/cursor/resources/app")
+    # (parent directory, install directory) pairs, in priority order
+    possible_dirs = [
+        ("/opt", "Cursor"),
+        ("/usr/share", "cursor"),
+        ("/opt", "cursor-bin"),
+        ("/usr/lib", "cursor"),
+        (os.path.expanduser("~/.local/share"), "cursor")
     ]
     
-    # return the first path that exists
-    return next((path for path in possible_paths if os.path.exists(path)), possible_paths[0])
+    # return the first path that exists; one readdir per parent rules out missing installs
+    for parent, name in possible_dirs:
+        path = os.path.join(parent, name, "resources", "app")
+        if name in _listdir(parent) and os.path.exists(path):
+            return path
+    return "/opt/Cursor/resources/app"
+
+# Cached on the timing value itself, so no config object is kept alive
+@lru_cache(maxsize=128)
+def _parse_timing(timing):
+    """
+    解析时间设置为(最小值, 最大值)元组。
+    
+    参数:
+        timing (str或float): 单个数值、"min-max"或"min,max"格式的时间设置
+        
+    返回值:
+        tuple: (min_time, max_time)
+        
+    异常:
+        ValueError: 当时间设置无法解析为数值时抛出
+    """
+    if isinstance(timing, str):
+        low, sep, high = timing.partition('-')
+        if not sep:
+            low, sep, high = timing.partition(',')
+        if sep:
+            return float(low), float(high)
+    # Single value, use it as both min and max
+    value = float(timing)
+    return value, value
 
 def get_random_wait_time(config, timing_key=None, min_time=None, max_time=None):
     """
@@ -121,25 +171,10 @@ def get_random_wait_time(config, timing_key=None, min_time=None, max_time=None):
     try:
         # Get timing value from config
         timing = config.get('Timing', {}).get(timing_key)
-        if not timing:
-            # Default to 0.5-1.5 seconds if timing not found
-            return random.uniform(0.5, 1.5)
-            
-        # Check if timing is a range (e.g., "0.5-1.5" or "0.5,1.5")
-        if isinstance(timing, str):
-            if '-' in timing:
-                min_time, max_time = map(float, timing.split('-'))
-            elif ',' in timing:
-                min_time, max_time = map(float, timing.split(','))
-            else:
-                # Single value, use it as both min and max
-                min_time = max_time = float(timing)
-        else:
-            # If timing is a number, use it as both min and max
-            min_time = max_time = float(timing)
-            
-        return random.uniform(min_time, max_time)
-        
+        # Default to 0.5-1.5 seconds if timing not found
+        bounds = _parse_timing(timing) if timing else (0.5, 1.5)
     except (ValueError, TypeError, AttributeError):
-        # Return default value if any error occurs
-        return random.uniform(0.5, 1.5) 
\ No newline at end of file
+        # Use default value if any error occurs
+        bounds = (0.5, 1.5)
+    
+    return random.uniform(*bounds)